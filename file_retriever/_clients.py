@@ -6,32 +6,282 @@ network drives.
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import copy
 import ftplib
+import functools
+import hashlib
+import inspect
 import io
 import logging
 import os
-import paramiko
+import queue
+import socket
 import stat
-from typing import Union
-from file_retriever.file import FileInfo, File
+import sys
+import tempfile
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Optional,
+    TypedDict,
+    TypeVar,
+    Union,
+)
+from file_retriever.file import FileInfo, File, _parse_mlsd_line
 from file_retriever.errors import (
     RetrieverFileError,
     RetrieverConnectionError,
     RetrieverAuthenticationError,
 )
 
+if TYPE_CHECKING:
+    import paramiko
+
 logger = logging.getLogger(__name__)
 
 
+def _rjoin(dir: str, name: str) -> str:
+    """
+    Joins a remote directory and file name. FTP and SFTP servers always use
+    `/` as a separator so `os.path.join` is not used for remote paths.
+    """
+    if not dir:
+        return name
+    return f"{dir.rstrip('/')}/{name}"
+
+
+def _tune_socket(sock: socket.socket, buffer_size: Optional[int] = None) -> None:
+    """
+    Disables Nagle's algorithm so short commands are not delayed. The
+    socket's send and receive buffers are only set if `buffer_size` is given
+    since setting them turns off the OS's automatic tuning of the buffers.
+    Options the platform does not support are ignored.
+    """
+    options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    if buffer_size is not None:
+        options += [
+            (socket.SOL_SOCKET, socket.SO_RCVBUF, buffer_size),
+            (socket.SOL_SOCKET, socket.SO_SNDBUF, buffer_size),
+        ]
+    for level, option, value in options:
+        try:
+            sock.setsockopt(level, option, value)
+        except OSError:
+            pass
+
+
+# salt for digests of passwords used in keys of connections shared between
+# clients so that passwords are not kept in the keys
+_CREDENTIALS_SALT = os.urandom(16)
+
+
+def _password_digest(password: str) -> bytes:
+    """Returns a salted digest of `password` to use in place of it in keys."""
+    return hashlib.sha256(_CREDENTIALS_SALT + password.encode()).digest()
+
+
+def _rbasename(path: str) -> str:
+    """
+    Returns the final component of a remote path. Unlike `os.path.basename`
+    this only splits on `/` regardless of the local platform.
+    """
+    return path.rpartition("/")[2]
+
+
+def _new_stream(file_size: int, spill_threshold: Optional[int]) -> BinaryIO:
+    """
+    Returns a stream to receive a file of `file_size` bytes into. Files larger
+    than `spill_threshold` are written to a temporary file on disk so that they
+    are not held in memory. Smaller files are received into an `io.BytesIO`
+    object allocated using `file_size`.
+    """
+    if spill_threshold is not None and file_size > spill_threshold:
+        return tempfile.TemporaryFile()
+    return io.BytesIO(bytes(max(file_size, 0)))
+
+
+def _write_stream(
+    file_stream: BinaryIO, write: Callable[[Any], Any], blocksize: int
+) -> None:
+    """
+    Passes content of `file_stream` to `write`. The buffer of an `io.BytesIO`
+    object is passed in a single call without being copied. Other streams are
+    read from their current position in `blocksize` chunks.
+    """
+    if isinstance(file_stream, io.BytesIO):
+        with file_stream.getbuffer() as data:
+            write(data)
+    else:
+        while chunk := file_stream.read(blocksize):
+            write(chunk)
+
+
+def _write_all(local_file: BinaryIO, data: Any) -> None:
+    """Writes all of `data` to `local_file`, retrying short writes."""
+    with memoryview(data) as view:
+        written = 0
+        while written < len(view):
+            written += local_file.write(view[written:])
+
+
+def _write_local(file_stream: BinaryIO, local_file: BinaryIO, blocksize: int) -> None:
+    """
+    Writes content of `file_stream` to `local_file`, a file opened for writing
+    without buffering. The buffer of an `io.BytesIO` object is written in
+    `blocksize` slices without being copied. Streams backed by a file on disk,
+    such as files spilled to a temporary file, are copied by the kernel with
+    `os.sendfile` where it is available and read in `blocksize` chunks
+    otherwise.
+    """
+    if isinstance(file_stream, io.BytesIO):
+        with file_stream.getbuffer() as data:
+            for offset in range(0, len(data), blocksize):
+                _write_all(local_file, data[offset : offset + blocksize])
+        return
+    if hasattr(os, "sendfile"):
+        offset = file_stream.tell()
+        try:
+            in_fd, out_fd = file_stream.fileno(), local_file.fileno()
+            size = os.fstat(in_fd).st_size
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+            file_stream.seek(offset)
+            return
+        except (OSError, ValueError):
+            file_stream.seek(offset)
+    while chunk := file_stream.read(blocksize):
+        _write_all(local_file, chunk)
+
+
+def _written_file_info(file: File) -> FileInfo:
+    """
+    Returns metadata for `file` once it has been written to a server using the
+    size of its stream and the current time rather than asking the server.
+    Permissions are not known so `file_mode` is 0.
+    """
+    return FileInfo(
+        file_name=file.file_name,
+        file_size=file.file_stream.seek(0, io.SEEK_END),
+        file_mtime=time.time(),
+        file_mode=None,
+    )
+
+
+def _parse_list_permissions(line: str) -> Optional[str]:
+    """Returns permissions in symbolic notation from a line of `LIST` output."""
+    return line[0:10]
+
+
+def _parse_list_size(line: str) -> Optional[int]:
+    """Returns size of file from a Unix-style line of `LIST` output if found."""
+    size = line.split(None, 5)[4]
+    return int(size) if size.isdigit() else None
+
+
+def _skip_list_permissions(line: str) -> None:
+    """For servers that do not return usable permissions in `LIST` output."""
+    return None
+
+
+_SERVER_PARSERS: dict[str, Callable[[str], Optional[str]]] = {
+    "baker-taylor": _skip_list_permissions,
+}
+
+# facts needed from `MLSD` output to create a `FileInfo` object without
+# retrieving anything else from the server
+_MLSD_FACTS = frozenset({"size", "modify", "unix.mode"})
+
+_T = TypeVar("_T")
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class _Credentials(TypedDict):
+    """Credentials kept by a client to open new connections to its server."""
+
+    username: str
+    password: str
+    host: str
+    port: int
+
+
+def _connection_errors() -> tuple[type[BaseException], ...]:
+    """
+    Returns the exceptions raised when a connection to a server is lost.
+    `paramiko.SSHException` is only included if paramiko has been imported,
+    which it always is before an SFTP connection is opened.
+    """
+    errors: tuple[type[BaseException], ...] = (OSError, EOFError, ftplib.error_temp)
+    paramiko = sys.modules.get("paramiko")
+    if paramiko is not None:
+        errors += (paramiko.SSHException,)
+    return errors
+
+
+def _reconnecting(method: _F) -> _F:
+    """
+    Wraps a client method so that it is retried once on a new connection if
+    it fails with a connection error because the connection to the server was
+    lost. Only methods that read from the server are wrapped since retrying a
+    write could write a file twice. Calls that were streaming a file into a
+    caller's `sink` are not retried. If reconnecting fails, the error is
+    raised from the original error.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self: "_BaseClient", *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except _connection_errors() as e:
+            sink = signature.bind(self, *args, **kwargs).arguments.get("sink")
+            if sink is not None:
+                raise
+            try:
+                reconnected = self._connection_lost() and self._reconnect()
+            except Exception as reconnect_error:
+                raise reconnect_error from e
+            if not reconnected:
+                raise
+        logger.debug("(%s) Reconnected to server. Retrying.", self.name)
+        return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
 class _BaseClient(ABC):
     """An abstract base class for FTP and SFTP clients."""
 
+    #: files larger than this many bytes are fetched to a temporary file on disk
+    #: rather than into memory. set to None to always fetch files into memory.
+    spill_threshold: Optional[int] = 64 << 20
+
+    #: number of seconds directory listings are cached for. listings are not
+    #: cached by default as files may be added or changed by other clients.
+    cache_ttl: float = 0.0
+
+    #: size in bytes to set the send and receive buffers of sockets to. left to
+    #: the OS by default, which tunes them automatically on most platforms.
+    socket_buffer_size: Optional[int] = None
+
+    # listings cached by `list_file_data` with the time they were made, by
+    # directory. each subclass creates its own dict when it is initialized.
+    _dir_cache: dict[str, tuple[float, dict[str, FileInfo]]]
+
     @abstractmethod
     def __init__(
         self, name, username: str, password: str, host: str, port: Union[str, int]
     ):
         self.name = name.upper()
-        self.connection: Union[ftplib.FTP, paramiko.SFTPClient] = (
+        self.connection: Union[ftplib.FTP, "paramiko.SFTPClient", None] = (
             self._connect_to_server(
                 username=username, password=password, host=host, port=int(port)
             )
@@ -44,9 +294,234 @@ class _BaseClient(ABC):
         password: str,
         host: str,
         port: int,
-    ) -> Union[ftplib.FTP, paramiko.SFTPClient]:
+    ) -> Union[ftplib.FTP, "paramiko.SFTPClient"]:
+        pass
+
+    def __enter__(self) -> "_BaseClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @abstractmethod
+    def _spawn(self) -> "_BaseClient":
+        pass
+
+    def _connection_lost(self) -> bool:
+        """Checks if the connection to the server has been lost."""
+        try:
+            return not self.is_active()
+        except Exception:
+            return True
+
+    @abstractmethod
+    def _reconnect(self) -> bool:
         pass
 
+    def _release(self) -> None:
+        """Closes a client created by `_spawn`."""
+        self.close()
+
+    def _map_workers(
+        self,
+        func: Callable[["_BaseClient", _T], Any],
+        items: list[_T],
+        workers: int,
+    ) -> list:
+        """
+        Calls `func` with a client and each item in `items` using a pool of
+        up to `workers` clients. The pool contains this client and clients
+        created with `_spawn` which are checked out by worker threads for
+        each item and closed once all items have been processed. Results are
+        returned in the same order as `items`.
+        """
+        pool: queue.Queue = queue.Queue()
+        pool.put(self)
+        spawned: list[_BaseClient] = []
+        try:
+            for _ in range(min(workers, len(items)) - 1):
+                client = self._spawn()
+                spawned.append(client)
+                pool.put(client)
+
+            def run(item: _T) -> Any:
+                client = pool.get()
+                try:
+                    return func(client, item)
+                finally:
+                    pool.put(client)
+
+            with ThreadPoolExecutor(max_workers=len(spawned) + 1) as executor:
+                return list(executor.map(run, items))
+        finally:
+            for client in spawned:
+                client._release()
+
+    def _cached_listing(self, dir: str) -> Optional[dict[str, FileInfo]]:
+        """
+        Returns metadata for files in `dir` by name if `dir` was listed with
+        `list_file_data` less than `cache_ttl` seconds ago, otherwise None.
+        The cached `FileInfo` objects are returned so callers should return
+        copies of them.
+        """
+        cached = self._dir_cache.get(dir)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
+
+    def _cache_listing(self, dir: str, files: list[FileInfo]) -> list[FileInfo]:
+        """
+        Caches copies of metadata for `files` listed in `dir` and returns
+        `files`. Nothing is cached if `cache_ttl` is 0.
+        """
+        if self.cache_ttl > 0:
+            self._dir_cache[dir] = (
+                time.monotonic(),
+                {i.file_name: copy.copy(i) for i in files},
+            )
+        return files
+
+    def _drop_listing(self, dir: str) -> None:
+        """Removes cached listing of `dir` after a file is written to it."""
+        self._dir_cache.pop(dir, None)
+
+    def _get_files_data(self, file_names: list[str], dir: str) -> list[FileInfo]:
+        """Retrieves metadata for each file in `file_names` in `dir` on server."""
+        return [self.get_file_data(file_name=i, dir=dir) for i in file_names]
+
+    def fetch_files(
+        self, files: list[Union[FileInfo, str]], dir: str, workers: int = 4
+    ) -> list[File]:
+        """
+        Retrieves multiple files from `dir` on server concurrently using up
+        to `workers` connections. Files may be given by name, in which case
+        their metadata is retrieved before any files are fetched. Workers
+        have their own listing caches so the listing of `dir` cached on this
+        client is dropped once the files have been fetched.
+
+        Args:
+            files:
+                list of `FileInfo` objects or names of files to fetch
+            dir: directory on server to fetch files from
+            workers: maximum number of connections to use
+
+        Returns:
+            list of `File` objects in the same order as `files`
+        """
+        file_names = [i for i in files if isinstance(i, str)]
+        file_data = dict(zip(file_names, self._get_files_data(file_names, dir)))
+        file_infos = [file_data[i] if isinstance(i, str) else i for i in files]
+        try:
+            return self._map_workers(
+                lambda client, file: client.fetch_file(file=file, dir=dir),
+                file_infos,
+                workers,
+            )
+        finally:
+            self._drop_listing(dir)
+
+    def fetch_file_to_path(self, file: FileInfo, dir: str, local_path: str) -> FileInfo:
+        """
+        Retrieves file from `dir` on server and writes it to `local_path` as it
+        is received rather than holding the whole file in memory. If the file
+        cannot be fetched in full, the partially written file is removed so
+        that it is not mistaken for a complete copy.
+
+        Args:
+            file:
+                `FileInfo` object representing metadata for file to fetch.
+                file is fetched based on `file_name` attribute.
+            dir: directory on server to fetch file from
+            local_path: path of local file to write to
+
+        Returns:
+            `FileInfo` object representing the local file
+
+        Raises:
+            RetrieverFileError:
+                if unable to fetch file or write it to `local_path`
+        """
+        try:
+            with open(local_path, "wb", buffering=0) as lf:
+                try:
+                    self.fetch_file(file=file, dir=dir, sink=lf)
+                    return FileInfo.from_stat_data(
+                        data=os.fstat(lf.fileno()),
+                        file_name=os.path.basename(local_path),
+                    )
+                except BaseException:
+                    lf.close()
+                    with contextlib.suppress(OSError):
+                        os.remove(local_path)
+                    raise
+        except OSError as e:
+            logger.error(
+                "(%s) Unable to write %s to %s: %s",
+                self.name,
+                file.file_name,
+                local_path,
+                e,
+            )
+            raise RetrieverFileError
+
+    def list_file_data_many(
+        self, dirs: list[str], workers: int = 4
+    ) -> dict[str, list[FileInfo]]:
+        """
+        Retrieves metadata for each file in multiple directories on server
+        concurrently using up to `workers` connections. Listings made by
+        workers other than this client are not cached on this client.
+
+        Args:
+            dirs: list of directories on server to interact with
+            workers: maximum number of connections to use
+
+        Returns:
+            dict mapping each directory in `dirs` to a list of `FileInfo`
+            objects representing files in the directory
+        """
+        return dict(
+            zip(
+                dirs,
+                self._map_workers(
+                    lambda client, dir: client.list_file_data(dir=dir),
+                    dirs,
+                    workers,
+                ),
+            )
+        )
+
+    def write_files(
+        self, files: list[File], dir: str, workers: int = 4, refresh: bool = True
+    ) -> list[FileInfo]:
+        """
+        Writes multiple files to `dir` on server concurrently using up to
+        `workers` connections. Workers have their own listing caches so the
+        listing of `dir` cached on this client is dropped once the files have
+        been written.
+
+        Args:
+            files: list of `File` objects representing files to write
+            dir: directory on server to write files to
+            workers: maximum number of connections to use
+            refresh:
+                whether to retrieve metadata for each file from the server
+                after it is written. see `write_file`.
+
+        Returns:
+            list of `FileInfo` objects in the same order as `files`
+        """
+        try:
+            return self._map_workers(
+                lambda client, file: client.write_file(
+                    file=file, dir=dir, remote=True, refresh=refresh
+                ),
+                files,
+                workers,
+            )
+        finally:
+            self._drop_listing(dir)
+
     @abstractmethod
     def _check_dir(self, dir: str) -> None:
         pass
@@ -60,7 +535,9 @@ class _BaseClient(ABC):
         pass
 
     @abstractmethod
-    def fetch_file(self, file: FileInfo, dir: str) -> File:
+    def fetch_file(
+        self, file: FileInfo, dir: str, sink: Optional[BinaryIO] = None
+    ) -> File:
         pass
 
     @abstractmethod
@@ -80,7 +557,9 @@ class _BaseClient(ABC):
         pass
 
     @abstractmethod
-    def write_file(self, file: File, dir: str, remote: bool) -> FileInfo:
+    def write_file(
+        self, file: File, dir: str, remote: bool, refresh: bool = True
+    ) -> FileInfo:
         pass
 
 
@@ -90,6 +569,27 @@ class _ftpClient(_BaseClient):
     interactions with servers using an `ftplib.FTP` object.
     """
 
+    #: size of blocks read from and written to data connection during transfers
+    blocksize: int = 1 << 18
+
+    #: number of seconds after a successful response from the server during
+    #: which `is_active` assumes the connection is alive without sending `NOOP`
+    idle_probe_interval: float = 5.0
+
+    #: maximum number of commands sent by `_pipelined_mdtm_size` before their
+    #: replies are read. keeps the server from blocking on a full send buffer
+    #: while the client is still sending commands for a large directory.
+    pipeline_batch: int = 64
+
+    #: maximum number of closed connections per server kept open for reuse.
+    #: connections are not kept unless this is set above 0.
+    pool_size: int = 0
+
+    # connections kept open by `close` for reuse, by server and a digest of
+    # the credentials used to log in. passwords are not kept in the key.
+    _pool: dict[tuple, list[ftplib.FTP]] = {}
+    _pool_lock = threading.Lock()
+
     def __init__(
         self,
         name: str,
@@ -109,16 +609,40 @@ class _ftpClient(_BaseClient):
 
         """
         self.name = name.upper()
+        self.server_type = ""
+        self._cwd: Optional[str] = None
+        self._features: Optional[frozenset[str]] = None
+        self._last_ok = 0.0
+        self._home: Optional[str] = None
+        self._pool_key: Optional[tuple] = None
+        self._dir_cache = {}
+        self._name_cache: dict[str, tuple[float, list[str]]] = {}
+        self._recv_buf = bytearray()
+        self._credentials = _Credentials(
+            username=username, password=password, host=host, port=int(port)
+        )
         if port in [21, "21"]:
-            self.connection: ftplib.FTP = self._connect_to_server(
+            self.connection: Optional[ftplib.FTP] = self._connect_to_server(
                 username=username, password=password, host=host, port=int(port)
             )
+            self.server_type = self._parse_welcome(self._ftp.getwelcome())
+        self._parse_permissions = next(
+            (
+                parser
+                for server, parser in _SERVER_PARSERS.items()
+                if server in host or server == self.server_type
+            ),
+            _parse_list_permissions,
+        )
 
     def _connect_to_server(
         self, username: str, password: str, host: str, port: int
     ) -> ftplib.FTP:
         """
-        Opens connection to server via FTP.
+        Opens connection to server via FTP. If `pool_size` is set, a
+        connection to the server left open by a closed client with the same
+        credentials is reused if it still answers `NOOP` cleanly rather than
+        connecting and logging in again.
 
         Returns:
             `ftplib.FTP` object
@@ -127,53 +651,432 @@ class _ftpClient(_BaseClient):
             ftplib.error_temp: if unable to connect to server
             ftplib.error_perm: if unable to authenticate with server
         """
+        self._pool_key = (host, port, username, _password_digest(password))
+        while True:
+            with self._pool_lock:
+                pooled = self._pool.get(self._pool_key)
+                ftp_client = pooled.pop() if pooled else None
+            if ftp_client is None:
+                break
+            if self._replies_cleanly(ftp_client):
+                return ftp_client
+            ftp_client.close()
         try:
             ftp_client = ftplib.FTP()
             ftp_client.connect(host=host, port=port)
+            if ftp_client.sock is not None:
+                _tune_socket(ftp_client.sock, self.socket_buffer_size)
             ftp_client.encoding = "utf-8"
             ftp_client.login(
                 user=username,
                 passwd=password,
             )
+            ftp_client.voidcmd("TYPE I")
             return ftp_client
         except ftplib.error_perm as e:
             logger.error(
-                f"({self.name}) Unable to authenticate with provided credentials: {e}"
+                "(%s) Unable to authenticate with provided credentials: %s",
+                self.name,
+                e,
             )
             raise RetrieverAuthenticationError
         except ftplib.error_temp as e:
-            logger.error(f"({self.name}) Unable to connect to {host}: {e}")
+            logger.error("(%s) Unable to connect to %s: %s", self.name, host, e)
             raise RetrieverConnectionError
 
+    @property
+    def _ftp(self) -> ftplib.FTP:
+        """
+        Returns the connection to the server. Raises `ConnectionError` if the
+        connection was closed or dropped so that `_reconnecting` methods open
+        a new connection instead of failing on None.
+        """
+        if self.connection is None:
+            raise ConnectionError("Not connected to server")
+        return self.connection
+
+    def _spawn(self) -> "_ftpClient":
+        """
+        Creates a copy of this client with a new connection to the server
+        using the same credentials. Settings changed on this client, eg.
+        `cache_ttl` or `blocksize`, are kept by the copy.
+        """
+        client = copy.copy(self)
+        client.connection = None
+        client._home = None
+        client._dir_cache = {}
+        client._name_cache = {}
+        client._recv_buf = bytearray()
+        client._reconnect()
+        return client
+
+    def _connection_lost(self) -> bool:
+        """
+        Checks if the connection to the server has been lost. `NOOP` is
+        always sent rather than relying on the last successful response.
+        """
+        self._last_ok = 0.0
+        return super()._connection_lost()
+
+    def _reconnect(self) -> bool:
+        """
+        Replaces a lost connection with a new connection to the server using
+        the same credentials.
+        """
+        if self.connection is not None:
+            self.connection.close()
+        self._cwd = None
+        self._last_ok = 0.0
+        self.connection = self._connect_to_server(**self._credentials)
+        return True
+
+    @staticmethod
+    def _replies_cleanly(connection: ftplib.FTP) -> bool:
+        """
+        Checks that `connection` answers `NOOP` with the reply for `NOOP`.
+        A connection left with an unread reply, eg. the `226` sent after an
+        interrupted transfer, answers with that reply instead and is not safe
+        to send further commands on.
+        """
+        try:
+            return connection.voidcmd("NOOP").startswith("200")
+        except ftplib.all_errors:
+            return False
+
+    @staticmethod
+    def _parse_welcome(welcome: str) -> str:
+        """
+        Parses server type from welcome message sent by server on connection
+        (eg. '220 (vsFTPd 3.0.5)' -> 'vsFTPd 3.0.5'). The welcome message is
+        only parsed once per connection.
+        """
+        start, end = welcome.find("("), welcome.rfind(")")
+        if start == -1 or end < start:
+            return sys.intern(welcome[4:])
+        return sys.intern(welcome[start + 1 : end])
+
+    def _drop_listing(self, dir: str) -> None:
+        """Removes cached listing and names of `dir` after a file is written."""
+        self._dir_cache.pop(dir, None)
+        self._name_cache.pop(dir, None)
+
+    def _has_feature(self, feature: str) -> bool:
+        """
+        Checks if server advertises `feature` (eg. 'MLST') in its response to
+        a `FEAT` command. `FEAT` is only sent the first time this is called
+        for a connection and the features are cached on the instance.
+        """
+        if self._features is None:
+            try:
+                resp = self._ftp.sendcmd("FEAT")
+            except ftplib.error_perm:
+                resp = ""
+            self._features = frozenset(
+                line.split()[0].upper()
+                for line in resp.splitlines()[1:-1]
+                if line.strip()
+            )
+        return feature in self._features
+
+    def _drop_feature(self, feature: str, error: ftplib.error_perm) -> None:
+        """
+        Stops using `feature` for this connection after the server rejected a
+        command that relies on it even though it was advertised.
+        """
+        logger.debug("(%s) %s not supported by server: %s", self.name, feature, error)
+        self._features = (self._features or frozenset()) - {feature}
+
+    def _pipeline(self, commands: list[str]) -> list[Optional[str]]:
+        """
+        Sends `commands` in a single write to the control connection and then
+        reads the responses in order. This avoids waiting a full round trip
+        for each command. Responses for commands the server returned an error
+        or an unexpected reply for are None. Commands containing a line break
+        are rejected as they are by `ftplib.FTP.putline`. If the connection
+        is lost, it is closed and a new connection is opened by the next
+        `_reconnecting` call. If reading a response fails for any other
+        reason, the remaining responses are read with `_resync`.
+
+        Raises:
+            ConnectionError: if the control connection has been closed
+            ValueError: if a command contains a line break
+        """
+        for i in commands:
+            if "\r" in i or "\n" in i:
+                raise ValueError("an illegal newline character should not be contained")
+        data = "".join(f"{i}\r\n" for i in commands).encode(self._ftp.encoding)
+        sock = self._ftp.sock
+        if sock is None:
+            raise ConnectionError("Control connection to server is closed")
+        responses: list[Optional[str]] = []
+        sent = False
+        try:
+            sock.sendall(data)
+            sent = True
+            for _ in commands:
+                try:
+                    responses.append(self._ftp.getresp())
+                except ftplib.Error:
+                    responses.append(None)
+        except _connection_errors():
+            self._drop_connection()
+            raise
+        except BaseException:
+            if sent:
+                self._resync(len(commands) - len(responses) - 1)
+            else:
+                self._drop_connection()
+            raise
+        self._last_ok = time.monotonic()
+        return responses
+
+    def _resync(self, pending: int) -> None:
+        """
+        Reads the `pending` responses left unread after reading a response to
+        pipelined commands failed and checks that the connection then answers
+        `NOOP` cleanly. If it does not, or the responses cannot be read, the
+        connection is closed with `_drop_connection` so that responses are
+        not read for the wrong commands.
+        """
+        connection = self._ftp
+        in_step = False
+        try:
+            with contextlib.suppress(Exception):
+                for _ in range(pending):
+                    with contextlib.suppress(ftplib.Error):
+                        connection.getresp()
+                in_step = self._replies_cleanly(connection)
+        finally:
+            if not in_step:
+                self._drop_connection()
+
+    def _drop_connection(self) -> None:
+        """
+        Closes a connection left in an unknown state, eg. with replies still
+        to be read, so that it is not used again or kept for reuse.
+        """
+        if self.connection is not None:
+            self.connection.close()
+        self.connection = None
+        self._cwd = None
+        self._last_ok = 0.0
+
+    def _pipelined_mdtm_size(
+        self, paths: list[str], sizes: Optional[list[Optional[int]]] = None
+    ) -> list[tuple[Optional[str], Optional[int]]]:
+        """
+        Sends an `MDTM` and a `SIZE` command for each file in `paths` using
+        `_pipeline`. Returns the modification time of each file as a string
+        (YYYYMMDDHHMMSS) and its size. Values the server could not return
+        are None. `SIZE` is not sent for files whose size is already known
+        from `sizes`. Commands are sent in batches of up to `pipeline_batch`
+        and the replies to each batch are read before the next is sent.
+        """
+        if sizes is None:
+            sizes = [None] * len(paths)
+        commands = []
+        for path, size in zip(paths, sizes):
+            commands.append(f"MDTM {path}")
+            if size is None:
+                commands.append(f"SIZE {path}")
+        responses = iter(
+            [
+                resp
+                for start in range(0, len(commands), self.pipeline_batch)
+                for resp in self._pipeline(
+                    commands[start : start + self.pipeline_batch]
+                )
+            ]
+        )
+        stats: list[tuple[Optional[str], Optional[int]]] = []
+        for size in sizes:
+            mdtm = next(responses)
+            if size is None:
+                resp = next(responses)
+                if resp and resp.startswith("213"):
+                    size = int(resp[4:].strip())
+            stats.append(
+                (mdtm[4:].strip() if mdtm and mdtm.startswith("213") else None, size)
+            )
+        return stats
+
+    def _raw_list(self, file_dir: str, cmd: str = "LIST") -> list[str]:
+        """
+        Retrieves output of `LIST` (or `MLSD`) command for `file_dir`. Reads the
+        data connection directly into a buffer and splits it into lines once
+        rather than calling a python callback for each line as `retrlines` does.
+        """
+        buf = bytearray()
+        conn = self._ftp.transfercmd(f"{cmd} {file_dir}")
+        _tune_socket(conn, self.socket_buffer_size)
+        try:
+            while chunk := conn.recv(65536):
+                buf.extend(chunk)
+        finally:
+            conn.close()
+        self._ftp.voidresp()
+        self._last_ok = time.monotonic()
+        return buf.decode(self._ftp.encoding).splitlines()
+
+    def _retr_into(
+        self, file_name: str, file_size: int, sink: Optional[BinaryIO] = None
+    ) -> BinaryIO:
+        """
+        Retrieves content of `file_name`. The connection is switched to binary
+        mode once when it is opened so no `TYPE` command is sent here. Data is
+        received directly into the buffer of an `io.BytesIO` object allocated
+        using `file_size` rather than being passed to a python callback one
+        block at a time as `retrbinary` does. The buffer is extended if the
+        server sends more data than expected and truncated if it sends less.
+        Files larger than `spill_threshold`, or files fetched into `sink`, are
+        received into a buffer kept on the client for reuse by later calls and
+        written to a temporary file or to `sink` instead.
+        """
+        fh = _new_stream(file_size, self.spill_threshold) if sink is None else sink
+        capacity = max(file_size, 0)
+        received = 0
+        conn = self._ftp.transfercmd(f"RETR {file_name}")
+        _tune_socket(conn, self.socket_buffer_size)
+        try:
+            if sink is not None or not isinstance(fh, io.BytesIO):
+                if len(self._recv_buf) != self.blocksize:
+                    self._recv_buf = bytearray(self.blocksize)
+                with memoryview(self._recv_buf) as view:
+                    while n := conn.recv_into(view, self.blocksize):
+                        _write_all(fh, view[:n])
+                        received += n
+            else:
+                while True:
+                    if received == capacity:
+                        fh.seek(capacity)
+                        fh.write(bytes(self.blocksize))
+                        capacity += self.blocksize
+                    with fh.getbuffer()[received:] as view:
+                        n = conn.recv_into(view, self.blocksize)
+                    if not n:
+                        break
+                    received += n
+        finally:
+            conn.close()
+        self._ftp.voidresp()
+        self._last_ok = time.monotonic()
+        if isinstance(fh, io.BytesIO) and sink is None:
+            fh.truncate(received)
+            fh.seek(received)
+        return fh
+
+    def _stor_from(self, file_name: str, file_stream: BinaryIO) -> None:
+        """
+        Writes content of `file_stream` to `file_name`. The buffer of an
+        `io.BytesIO` object is passed to the socket without being copied into
+        chunks. Other streams, such as files spilled to a temporary file, are
+        sent with `socket.sendfile` which copies the file in the kernel where
+        the platform supports it. Unlike `storbinary`, no `TYPE` command is
+        sent before each upload since the connection is switched to binary
+        mode when it is opened.
+        """
+        conn = self._ftp.transfercmd(f"STOR {file_name}")
+        _tune_socket(conn, self.socket_buffer_size)
+        try:
+            if isinstance(file_stream, io.BytesIO):
+                _write_stream(file_stream, conn.sendall, self.blocksize)
+            else:
+                conn.sendfile(file_stream)
+        finally:
+            conn.close()
+        self._ftp.voidresp()
+        self._last_ok = time.monotonic()
+
+    def _pwd(self) -> str:
+        """
+        Returns the current working directory on server. The directory is
+        only requested from the server if it is not already known.
+        """
+        if self._cwd is None:
+            self._cwd = self._ftp.pwd()
+            if self._home is None:
+                self._home = self._cwd
+        return self._cwd
+
     def _check_dir(self, dir: str) -> None:
-        """Changes directory to `dir` if not already in `dir`."""
-        if self.connection.pwd().lstrip("/") != dir.lstrip("/"):
-            self.connection.cwd(dir)
+        """
+        Changes directory to `dir` if not already in `dir`. An empty `dir`
+        refers to the current directory so nothing is sent to the server.
+        """
+        if not dir:
+            return
+        if self._pwd().lstrip("/") != dir.lstrip("/"):
+            try:
+                self._ftp.cwd(dir)
+            except ftplib.all_errors:
+                self._cwd = None
+                raise
+            self._cwd = dir
         else:
             pass
 
     def _is_file(self, dir: str, file_name: str) -> bool:
         """Checks if object is a file or directory."""
-        current_dir = self.connection.pwd()
+        current_dir = self._pwd()
         if dir == "":
             dir = current_dir
         try:
-            self.connection.voidcmd(f"CWD {dir}/{file_name}")
+            self._ftp.voidcmd(f"CWD {_rjoin(dir, file_name)}")
+            self._cwd = _rjoin(dir, file_name)
             self._check_dir(current_dir)
             return False
         except ftplib.error_perm:
             return True
 
     def close(self) -> None:
-        """Closes connection to server."""
-        self.connection.close()
-
-    def fetch_file(self, file: FileInfo, dir: str) -> File:
+        """
+        Closes connection to server. If `pool_size` is set, up to `pool_size`
+        connections to each server are instead kept open to be reused by
+        clients created later with the same credentials. Connections are only
+        kept if they are in the directory they logged in to and answer `NOOP`
+        cleanly.
+        """
+        connection, self.connection = self.connection, None
+        self._cwd, cwd = None, self._cwd
+        self._last_ok = 0.0
+        if connection is None:
+            return
+        if (
+            self.pool_size > 0
+            and self._pool_key is not None
+            and self._home in (None, cwd)
+            and self._replies_cleanly(connection)
+        ):
+            with self._pool_lock:
+                pooled = self._pool.setdefault(self._pool_key, [])
+                if len(pooled) < self.pool_size:
+                    pooled.append(connection)
+                    return
+        connection.close()
+
+    @classmethod
+    def drain_pool(cls) -> None:
+        """Closes all connections kept open for reuse by `close`."""
+        with cls._pool_lock:
+            pooled = [i for connections in cls._pool.values() for i in connections]
+            cls._pool.clear()
+        for connection in pooled:
+            connection.close()
+
+    @_reconnecting
+    def fetch_file(
+        self, file: FileInfo, dir: str, sink: Optional[BinaryIO] = None
+    ) -> File:
         """
         Retrieves file from `dir` on server as `File` object. The returned
         `File` object contains the file's content as an `io.BytesIO` object
         in the `File.file_stream` attribute and the file's metadata in the other
-        attributes.
+        attributes. Data is received directly into an `io.BytesIO` object
+        allocated using the size of the file so that it does not need to be
+        resized as data is received. Files larger than `spill_threshold` are
+        fetched to a temporary file instead of an `io.BytesIO` object. If
+        `sink` is given, the file's content is written to it as it is received
+        and it is used as the returned `File.file_stream`.
 
         Args:
             file:
@@ -181,6 +1084,9 @@ class _ftpClient(_BaseClient):
                 file is fetched based on `file_name` attribute.
             dir:
                 directory on server to fetch file from
+            sink:
+                optional binary file object opened for writing to stream the
+                file's content to, eg. a file on local disk
 
         Returns:
             `File` object representing content and metadata of fetched file
@@ -189,25 +1095,29 @@ class _ftpClient(_BaseClient):
             ftplib.error_perm: if unable to retrieve file from server
 
         """
-        current_dir = self.connection.pwd()
         try:
-            self._check_dir(dir)
-            fh = io.BytesIO()
-            self.connection.retrbinary(f"RETR {file.file_name}", fh.write)
-            fetched_file = File.from_fileinfo(file=file, file_stream=fh)
-            self._check_dir(current_dir)
-            return fetched_file
+            fh = self._retr_into(_rjoin(dir, file.file_name), file.file_size, sink)
+            return File.from_fileinfo(file=file, file_stream=fh)
         except ftplib.error_perm as e:
             logger.error(
-                f"({self.name}) Unable to retrieve {file.file_name} from {dir}: {e}"
+                "(%s) Unable to retrieve %s from %s: %s",
+                self.name,
+                file.file_name,
+                dir,
+                e,
             )
             raise RetrieverFileError
 
+    @_reconnecting
     def get_file_data(self, file_name: str, dir: str) -> FileInfo:
         """
-        Retrieves metadata for file on server. Requires multiple
-        calls to server to retrieve file size, modification time,
-        and permissions.
+        Retrieves metadata for file on server. If the server supports the
+        `MLST` command, metadata is retrieved with a single call to the
+        server. Otherwise multiple calls are required to retrieve file size,
+        modification time, and permissions. If `dir` was listed with
+        `list_file_data` less than `cache_ttl` seconds ago and the file was
+        included in the listing, the cached metadata is returned without
+        a request to the server.
 
         The Baker & Taylor server does not provide the same amount
         of metadata as other servers so file permissions are not retrieved.
@@ -223,48 +1133,124 @@ class _ftpClient(_BaseClient):
             ftplib.error_perm:
                 if unable to retrieve file data due to permissions error
         """
-        current_dir = self.connection.pwd()
-        try:
-            self._check_dir(dir)
+        cached = self._cached_listing(dir)
+        if cached is not None and file_name in cached:
+            return copy.copy(cached[file_name])
+        return self._stat(file_name=file_name, dir=dir)
 
-            permissions = None
-
-            def get_file_permissions(data):
-                nonlocal permissions
-                if "baker-taylor" not in self.connection.host:
-                    permissions = data[0:10]
+    def _stat(self, file_name: str, dir: str) -> FileInfo:
+        """
+        Retrieves metadata for file in `dir` on server without using cached
+        listings. Uses `MLST` if the server supports it, otherwise the file's
+        size and modification time are requested with pipelined commands and
+        its permissions are read from a `LIST` of the file.
+        """
+        if self._has_feature("MLST"):
+            file_info = self._mlst(file_name=file_name, dir=dir)
+            if file_info is not None:
+                return file_info
+        try:
+            mtime, size = self._pipelined_mdtm_size([_rjoin(dir, file_name)])[0]
+            return self._get_file_data(
+                file_name=file_name, dir=dir, mdtm=mtime, size=size
+            )
+        except ftplib.error_perm:
+            raise RetrieverFileError
 
-            self.connection.retrlines(f"LIST {file_name}", get_file_permissions)
-            size = self.connection.size(file_name)
-            time = self.connection.voidcmd(f"MDTM {file_name}")
-            if size is None or time is None:
-                logger.error(
-                    f"({self.name}) Unable to retrieve file data for {file_name}."
-                )
+    def _mlst(self, file_name: str, dir: str) -> Optional[FileInfo]:
+        """
+        Retrieves metadata for file in `dir` on server with a single `MLST`
+        command. The path is sent with the command so the working directory
+        does not need to be changed. If the server leaves out the `unix.mode`
+        fact, permissions are read from a `LIST` of the file. Returns None if
+        the server does not implement `MLST`.
+        """
+        try:
+            resp = self._ftp.sendcmd(f"MLST {_rjoin(dir, file_name)}")
+        except ftplib.error_perm as e:
+            if str(e).startswith("50"):
+                self._drop_feature("MLST", e)
+                return None
+            raise RetrieverFileError
+        facts_lines = [i[1:] for i in resp.splitlines() if i.startswith(" ")]
+        facts = _parse_mlsd_line(facts_lines[0])[1] if facts_lines else {}
+        if (
+            facts.get("type", "file").lower() != "file"
+            or "size" not in facts
+            or "modify" not in facts
+        ):
+            logger.error(
+                "(%s) Unable to retrieve file data for %s.", self.name, file_name
+            )
+            raise RetrieverFileError
+        file_mode = None
+        if "unix.mode" not in facts:
+            try:
+                lines = self._raw_list(_rjoin(dir, file_name))
+            except ftplib.error_perm:
                 raise RetrieverFileError
-            self._check_dir(current_dir)
-            return FileInfo(
-                file_name=file_name,
-                file_size=size,
-                file_mtime=time[4:],
-                file_mode=permissions,
+            file_mode = self._parse_permissions(lines[-1]) if lines else None
+        return FileInfo.from_mlsd_facts(
+            file_name=file_name, facts=facts, file_mode=file_mode
+        )
+
+    def _get_file_data(
+        self,
+        file_name: str,
+        dir: str,
+        mdtm: Optional[str],
+        size: Optional[int],
+        line: Optional[str] = None,
+    ) -> FileInfo:
+        """
+        Combines the modification time and size returned by
+        `_pipelined_mdtm_size` for a file in `dir` on server with its
+        permissions. Permissions are parsed from `line` if the file's line of
+        `LIST` output is already known, otherwise the file is listed.
+        """
+        if size is None or mdtm is None:
+            logger.error(
+                "(%s) Unable to retrieve file data for %s.", self.name, file_name
             )
-        except ftplib.error_perm:
             raise RetrieverFileError
+        if line is None:
+            lines = self._raw_list(_rjoin(dir, file_name))
+            line = lines[-1] if lines else None
+        permissions = self._parse_permissions(line) if line else None
+        return FileInfo(
+            file_name=file_name,
+            file_size=size,
+            file_mtime=mdtm,
+            file_mode=permissions,
+        )
 
     def is_active(self) -> bool:
         """
-        Checks if connection to server is active.
+        Checks if connection to server is active. A `NOOP` command is only
+        sent if the server has not responded successfully to a command or
+        transfer within the last `idle_probe_interval` seconds. A connection
+        that fails to respond to `NOOP` is reported as inactive rather than
+        raising an error.
 
         Returns:
             bool: True if connection is active, False otherwise
         """
-        status = self.connection.voidcmd("NOOP")
+        if self.connection is None:
+            return False
+        if time.monotonic() - self._last_ok < self.idle_probe_interval:
+            return True
+        try:
+            status = self._ftp.voidcmd("NOOP")
+        except ftplib.all_errors:
+            status = ""
         if status.startswith("2"):
+            self._last_ok = time.monotonic()
             return True
         else:
+            self._last_ok = 0.0
             return False
 
+    @_reconnecting
     def list_file_data(self, dir: str) -> list[FileInfo]:
         """
         Retrieves metadata for each file in `dir` on server. Metadata will be
@@ -272,6 +1258,15 @@ class _ftpClient(_BaseClient):
         that is actually a directory, the file will be skipped and not
         included in the returned list.
 
+        Metadata is retrieved with a single `MLSD` command if the server
+        advertises support for it. Otherwise, files and their permissions are
+        read from a single `LIST` of `dir` and the modification time of all
+        files is requested together with pipelined commands. The size of each
+        file is taken from its line of `LIST` output and is only requested
+        from the server if it cannot be read from the line. The metadata is
+        cached for `cache_ttl` seconds and returned by repeat calls for `dir`
+        and by `get_file_data`.
+
         Args:
             dir: directory on server to interact with
 
@@ -284,25 +1279,148 @@ class _ftpClient(_BaseClient):
                 if unable to list file data due to permissions error
 
         """
+        cached = self._cached_listing(dir)
+        if cached is not None:
+            return [copy.copy(i) for i in cached.values()]
         files = []
-        current_dir = self.connection.pwd()
+        if self._has_feature("MLST"):
+            try:
+                entries = [
+                    (name, facts)
+                    for name, facts in map(
+                        _parse_mlsd_line, self._raw_list(dir, cmd="MLSD")
+                    )
+                    if facts.get("type", "").lower() == "file"
+                ]
+                if all(_MLSD_FACTS <= facts.keys() for _, facts in entries):
+                    files = [
+                        FileInfo.from_mlsd_facts(file_name=name, facts=facts)
+                        for name, facts in entries
+                    ]
+                else:
+                    files = self._complete_mlsd_facts(dir, entries)
+                return self._cache_listing(dir, files)
+            except ftplib.error_perm as e:
+                if not str(e).startswith("50"):
+                    logger.error(
+                        "(%s) Unable to retrieve file list from %s: %s",
+                        self.name,
+                        dir,
+                        e,
+                    )
+                    raise RetrieverFileError
+                self._drop_feature("MLST", e)
         try:
-            file_names = self.connection.nlst(dir)
-            for name in file_names:
-                file_base_name = os.path.basename(name)
-                file_obj = self._is_file(dir, file_base_name)
-                if file_obj is True:
-                    file_info = self.get_file_data(file_name=file_base_name, dir=dir)
-                    files.append(file_info)
-                self._check_dir(current_dir)
+            listing = self._list_files(dir)
+            if listing:
+                stats = self._pipelined_mdtm_size(
+                    [_rjoin(dir, i) for i in listing],
+                    [_parse_list_size(i) if i else None for i in listing.values()],
+                )
+                for (file_name, line), (mtime, size) in zip(listing.items(), stats):
+                    files.append(
+                        self._get_file_data(
+                            file_name=file_name,
+                            dir=dir,
+                            mdtm=mtime,
+                            size=size,
+                            line=line,
+                        )
+                    )
         except ftplib.error_perm as e:
-            logger.error(f"({self.name}) Unable to retrieve file list from {dir}: {e}")
+            logger.error(
+                "(%s) Unable to retrieve file list from %s: %s", self.name, dir, e
+            )
             raise RetrieverFileError
+        return self._cache_listing(dir, files)
+
+    def _complete_mlsd_facts(
+        self, dir: str, entries: list[tuple[str, dict[str, str]]]
+    ) -> list[FileInfo]:
+        """
+        Creates `FileInfo` objects for files listed by `MLSD` when the server
+        left out any of the optional `size`, `modify` or `unix.mode` facts.
+        Missing sizes and permissions are taken from each file's line of
+        `LIST` output as they are for servers without `MLSD`. Modification
+        times, and sizes not found in `LIST` output, are requested with
+        pipelined `MDTM` and `SIZE` commands.
+        """
+        lines = self._list_files(dir)
+        known: dict[str, tuple[Optional[str], Optional[int]]] = {}
+        for name, facts in entries:
+            line = lines.get(name)
+            if "size" in facts:
+                size: Optional[int] = int(facts["size"])
+            else:
+                size = _parse_list_size(line) if line else None
+            known[name] = (facts["modify"][:14] if "modify" in facts else None, size)
+        pending = [name for name, stats in known.items() if None in stats]
+        if pending:
+            known.update(
+                zip(
+                    pending,
+                    self._pipelined_mdtm_size(
+                        [_rjoin(dir, name) for name in pending],
+                        [known[name][1] for name in pending],
+                    ),
+                )
+            )
+        files = []
+        for name, facts in entries:
+            mtime, size = known[name]
+            if mtime is None or size is None:
+                logger.error(
+                    "(%s) Unable to retrieve file data for %s.", self.name, name
+                )
+                raise RetrieverFileError
+            line = lines.get(name)
+            files.append(
+                FileInfo.from_mlsd_facts(
+                    file_name=name,
+                    facts={**facts, "size": str(size), "modify": mtime},
+                    file_mode=self._parse_permissions(line) if line else None,
+                )
+            )
         return files
 
+    def _list_files(self, dir: str) -> dict[str, Optional[str]]:
+        """
+        Returns the names of files in `dir` on server mapped to the line of
+        `LIST` output for each file. Files are told apart from directories
+        using the file type in a single `LIST` of `dir`. Lines for directories
+        are skipped without being split into fields. Symbolic links are
+        checked with `_is_file`. If the server does not return a Unix-style
+        listing, names are retrieved with `NLST` and each object is checked
+        with `_is_file` instead, in which case no lines are returned.
+        """
+        files: dict[str, Optional[str]] = {}
+        for line in self._raw_list(dir):
+            if not line.strip() or line.startswith("total "):
+                continue
+            if line[0] == "d" and line[1:10].strip("rwxsStT-") == "":
+                continue
+            fields = line.split(None, 8)
+            if len(fields) < 9 or fields[0][0] not in "-dl":
+                break
+            if fields[0][0] == "-":
+                files[fields[8]] = line
+            elif fields[0][0] == "l":
+                name = fields[8].split(" -> ")[0]
+                if self._is_file(dir, name) is True:
+                    files[name] = None
+        else:
+            return files
+        return {
+            _rbasename(i): None
+            for i in self._ftp.nlst(dir)
+            if self._is_file(dir, _rbasename(i)) is True
+        }
+
+    @_reconnecting
     def list_file_names(self, dir: str) -> list[str]:
         """
-        Retrieves names of all files in `dir` on server.
+        Retrieves names of all files in `dir` on server. The names are cached
+        for `cache_ttl` seconds and returned by repeat calls for `dir`.
 
         Args:
             dir: directory on server to interact with
@@ -316,19 +1434,32 @@ class _ftpClient(_BaseClient):
                 if unable to list file data due to permissions error
 
         """
+        cached = self._name_cache.get(dir)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+            return list(cached[1])
         try:
-            files = self.connection.nlst(dir)
-            return [os.path.basename(i) for i in files]
+            files = [_rbasename(i) for i in self._ftp.nlst(dir)]
+            if self.cache_ttl > 0:
+                self._name_cache[dir] = (time.monotonic(), files)
+            return list(files)
         except ftplib.error_perm as e:
-            logger.error(f"({self.name}) Unable to retrieve file list from {dir}: {e}")
+            logger.error(
+                "(%s) Unable to retrieve file list from %s: %s", self.name, dir, e
+            )
             raise RetrieverFileError
 
-    def write_file(self, file: File, dir: str, remote: bool) -> FileInfo:
+    def write_file(
+        self, file: File, dir: str, remote: bool, refresh: bool = True
+    ) -> FileInfo:
         """
         Writes file to directory. If `remote` is True, then file is written
         to `dir` on server. If `remote` is False, then file is written to local
         directory. Retrieves metadata for file after is has been written
-        and returns metadata as `FileInfo`.
+        and returns metadata as `FileInfo`. Metadata for a file written to the
+        server, including its permissions, is retrieved with a single `MLST`
+        command if the server supports it. Writes are not retried if the
+        connection to the server is lost but a new connection is opened first
+        if an earlier call dropped the connection.
 
         Args:
             file:
@@ -339,6 +1470,10 @@ class _ftpClient(_BaseClient):
             remote:
                 bool indicating if file should be written to remote or local
                 directory
+            refresh:
+                whether to retrieve metadata for a file written to the server
+                from the server. if False, the size of `File.file_stream` and
+                the current time are returned instead, saving a round trip.
 
         Returns:
             `FileInfo` object representing written file
@@ -350,28 +1485,37 @@ class _ftpClient(_BaseClient):
         file.file_stream.seek(0)
 
         if remote is True:
+            if self.connection is None:
+                self._reconnect()
             try:
-                self._check_dir(dir)
-                self.connection.storbinary(f"STOR {file.file_name}", file.file_stream)
-                return self.get_file_data(file_name=file.file_name, dir=dir)
+                path = _rjoin(dir, file.file_name)
+                self._drop_listing(dir)
+                self._stor_from(path, file.file_stream)
+                if not refresh:
+                    return _written_file_info(file)
+                return self._stat(file_name=file.file_name, dir=dir)
             except ftplib.error_perm as e:
                 logger.error(
-                    f"({self.name}) Unable to write {file.file_name} "
-                    f"to remote directory: {e}"
+                    "(%s) Unable to write %s to remote directory: %s",
+                    self.name,
+                    file.file_name,
+                    e,
                 )
                 raise RetrieverFileError
         else:
             try:
-                local_file = f"{dir}/{file.file_name}"
-                with open(local_file, "wb") as lf:
-                    lf.write(file.file_stream.getbuffer())
-                return FileInfo.from_stat_data(
-                    data=os.stat(local_file), file_name=file.file_name
-                )
+                local_file = os.path.join(dir, file.file_name)
+                with open(local_file, "wb", buffering=0) as lf:
+                    _write_local(file.file_stream, lf, self.blocksize)
+                    return FileInfo.from_stat_data(
+                        data=os.fstat(lf.fileno()), file_name=file.file_name
+                    )
             except OSError as e:
                 logger.error(
-                    f"({self.name}) Unable to write {file.file_name} "
-                    f"to local directory: {e}"
+                    "(%s) Unable to write %s to local directory: %s",
+                    self.name,
+                    file.file_name,
+                    e,
                 )
                 raise RetrieverFileError
 
@@ -382,6 +1526,41 @@ class _sftpClient(_BaseClient):
     interactions with servers using a `paramiko.SFTPClient` object.
     """
 
+    #: SSH channel window size requested for the SFTP session
+    window_size: int = 2**27
+
+    #: largest SSH packet the server may send on the SFTP session
+    max_packet_size: int = 2**19
+
+    #: ciphers offered to the server ahead of paramiko's defaults, in order of
+    #: preference. AES-GCM is hardware accelerated on most CPUs and does not
+    #: need a separate MAC to be computed for each packet.
+    preferred_ciphers: tuple[str, ...] = (
+        "aes128-gcm@openssh.com",
+        "aes256-gcm@openssh.com",
+    )
+
+    #: size of blocks read from remote files during transfers
+    blocksize: int = 1 << 18
+
+    #: size of each read request sent to the server while prefetching a file.
+    #: paramiko's default (`SFTPFile.MAX_REQUEST_SIZE`) is used as not all
+    #: servers accept larger requests.
+    request_size: int = 32768
+
+    #: maximum number of read requests outstanding while prefetching a file
+    prefetch_requests: int = 64
+
+    # SSH connections shared by clients logged in to the same server with the
+    # same credentials, and the number of clients using each of them. passwords
+    # are not kept in the key.
+    _shared_ssh: dict[tuple, tuple["paramiko.SSHClient", int]] = {}
+    _shared_ssh_lock = threading.Lock()
+
+    # path of host keys file found or created when the first SSH connection
+    # was opened
+    _key_file: Optional[str] = None
+
     def __init__(
         self,
         name: str,
@@ -389,6 +1568,9 @@ class _sftpClient(_BaseClient):
         password: str,
         host: str,
         port: Union[str, int],
+        compress: bool = False,
+        request_size: Optional[int] = None,
+        prefetch_requests: Optional[int] = None,
     ):
         """Initializes client instance.
 
@@ -398,11 +1580,33 @@ class _sftpClient(_BaseClient):
             password: password for server
             host: server address
             port: port number for server
+            compress:
+                whether to request compression of the SSH transport. can
+                speed up transfers of text files such as MARC records over
+                slow links at the cost of CPU time.
+            request_size:
+                size in bytes of each read request sent while fetching a
+                file. larger requests can speed up transfers from servers
+                that support them.
+            prefetch_requests:
+                maximum number of read requests outstanding while fetching
+                a file.
 
         """
         self.name = name.upper()
+        self.compress = compress
+        if request_size is not None:
+            self.request_size = request_size
+        if prefetch_requests is not None:
+            self.prefetch_requests = prefetch_requests
+        self._cwd: Optional[str] = None
+        self._dir_cache = {}
+        self._ssh_key: Optional[tuple] = None
+        self._credentials = _Credentials(
+            username=username, password=password, host=host, port=int(port)
+        )
         if port in [22, "22"]:
-            self.connection: paramiko.SFTPClient = self._connect_to_server(
+            self.connection: "paramiko.SFTPClient" = self._connect_to_server(
                 username=username, password=password, host=host, port=int(port)
             )
 
@@ -415,16 +1619,41 @@ class _sftpClient(_BaseClient):
         Returns:
             str: path to `vendor_hosts` file containing host keys
         """
+        import paramiko
+
         ssh = paramiko.SSHClient()
         ssh.load_host_keys(filename=os.path.expanduser("~/.ssh/known_hosts"))
         ssh.save_host_keys(filename=os.path.expanduser("~/.ssh/vendor_hosts"))
         return os.path.expanduser("~/.ssh/vendor_hosts")
 
+    def _host_keys_file(self) -> str:
+        """
+        Returns path of the `vendor_hosts` file containing host keys, creating
+        it if needed. The file is only looked for the first time an SSH
+        connection is opened by any client.
+        """
+        if _sftpClient._key_file is None:
+            if os.path.isfile(os.path.expanduser("~/.ssh/vendor_hosts")):
+                key_file = os.path.expanduser("~/.ssh/vendor_hosts")
+            elif os.path.isfile(".ssh/vendor_hosts"):
+                key_file = ".ssh/vendor_hosts"
+            else:
+                logger.debug(
+                    "(%s) Host keys file not found. Creating new file.", self.name
+                )
+                key_file = self.__configure_host_keys()
+            _sftpClient._key_file = key_file
+        return _sftpClient._key_file
+
     def _connect_to_server(
         self, username: str, password: str, host: str, port: int
-    ) -> paramiko.SFTPClient:
+    ) -> "paramiko.SFTPClient":
         """
-        Opens connection to server via SFTP.
+        Opens connection to server via SFTP. If another client is already
+        connected to the server with the same credentials, a new SFTP session
+        is opened on its SSH transport rather than repeating the SSH handshake.
+        The transport is closed once every client using it has been closed or
+        has failed to open its SFTP session.
 
         Returns:
             `paramiko.SFTPClient` object
@@ -434,13 +1663,32 @@ class _sftpClient(_BaseClient):
             paramiko.AuthenticationException: if unable to authenticate with server
 
         """
-        if os.path.isfile(os.path.expanduser("~/.ssh/vendor_hosts")):
-            key_file = os.path.expanduser("~/.ssh/vendor_hosts")
-        elif os.path.isfile(".ssh/vendor_hosts"):
-            key_file = ".ssh/vendor_hosts"
-        else:
-            logger.debug(f"({self.name}) Host keys file not found. Creating new file.")
-            key_file = self.__configure_host_keys()
+        key = (host, port, username, _password_digest(password), self.compress)
+        with self._shared_ssh_lock:
+            ssh, users = self._shared_ssh.get(key, (None, 0))
+            transport = ssh.get_transport() if ssh is not None else None
+            if ssh is None or transport is None or not transport.is_active():
+                ssh, users = self._open_ssh(username, password, host, port), 0
+            self._shared_ssh[key] = (ssh, users + 1)
+        self._ssh = ssh
+        self._ssh_key = key
+        try:
+            return ssh.open_sftp()
+        except BaseException:
+            self._release_ssh()
+            raise
+
+    def _open_ssh(
+        self, username: str, password: str, host: str, port: int
+    ) -> "paramiko.SSHClient":
+        """
+        Opens an SSH connection to server to open SFTP sessions on. The
+        transport's socket is only tuned with `_tune_socket` if it is a socket
+        rather than a channel or proxy command.
+        """
+        import paramiko
+
+        key_file = self._host_keys_file()
         try:
             ssh = paramiko.SSHClient()
             ssh.load_system_host_keys(filename=key_file)
@@ -450,47 +1698,151 @@ class _sftpClient(_BaseClient):
                 port=port,
                 username=username,
                 password=password,
+                compress=self.compress,
+                transport_factory=self._new_transport,
             )
-            sftp_client = ssh.open_sftp()
-            return sftp_client
+            transport = ssh.get_transport()
+            if transport is not None:
+                transport.default_window_size = self.window_size
+                transport.default_max_packet_size = self.max_packet_size
+                if isinstance(transport.sock, socket.socket):
+                    _tune_socket(transport.sock, self.socket_buffer_size)
+            return ssh
         except paramiko.AuthenticationException as e:
             logger.error(
-                f"({self.name}) Unable to authenticate with provided credentials: {e}"
+                "(%s) Unable to authenticate with provided credentials: %s",
+                self.name,
+                e,
             )
             raise RetrieverAuthenticationError
         except paramiko.SSHException as e:
-            logger.error(f"({self.name}) Unable to connect to {host}: {e}")
+            logger.error("(%s) Unable to connect to %s: %s", self.name, host, e)
             raise RetrieverConnectionError
 
+    def _new_transport(self, *args, **kwargs) -> "paramiko.Transport":
+        """
+        Creates the SSH transport used by `_open_ssh`, offering any of
+        `preferred_ciphers` that paramiko supports before its other ciphers.
+        """
+        import paramiko
+
+        transport = paramiko.Transport(*args, **kwargs)
+        options = transport.get_security_options()
+        preferred = tuple(i for i in self.preferred_ciphers if i in options.ciphers)
+        options.ciphers = preferred + tuple(
+            i for i in options.ciphers if i not in preferred
+        )
+        return transport
+
+    def _new_channel(self) -> "paramiko.SFTPClient":
+        """
+        Opens a new SFTP session on the SSH transport already used by this
+        client so that a new SSH handshake is not needed.
+        """
+        return self._ssh.open_sftp()
+
+    def _spawn(self) -> "_sftpClient":
+        """Creates a client sharing this client's SSH transport."""
+        client = copy.copy(self)
+        client.connection = self._new_channel()
+        client._cwd = None
+        client._dir_cache = {}
+        client._ssh_key = None
+        return client
+
+    def _release(self) -> None:
+        """Closes SFTP session without closing the shared SSH transport."""
+        self.connection.close()
+
+    def _reconnect(self) -> bool:
+        """
+        Replaces a lost connection with a new SFTP session. A new SSH
+        transport is opened if the shared transport was also lost. Clients
+        created with `_spawn` are not reconnected.
+        """
+        if self._ssh_key is None:
+            return False
+        self.close()
+        self.connection = self._connect_to_server(**self._credentials)
+        return True
+
     def _check_dir(self, dir: str) -> None:
-        """Changes directory to `dir` if not already in `dir`."""
-        wd = self.connection.getcwd()
-        if wd is None:
-            self.connection.chdir(dir)
-        elif isinstance(wd, str) and wd.lstrip("/") != dir.lstrip("/"):
-            self.connection.chdir(None)
-            self.connection.chdir(dir)
-        else:
-            pass
+        """
+        Changes directory to `dir` if not already in `dir`. The last directory
+        changed to is cached so that repeated calls for the same `dir` do not
+        require any requests to the server. An empty `dir` refers to the
+        current directory so nothing is sent to the server.
+        """
+        if not dir or self._cwd == dir:
+            return
+        try:
+            wd = self.connection.getcwd()
+            if wd is None:
+                self.connection.chdir(dir)
+            elif isinstance(wd, str) and wd.lstrip("/") != dir.lstrip("/"):
+                if not dir.startswith("/"):
+                    self.connection.chdir(None)
+                self.connection.chdir(dir)
+            else:
+                pass
+        except OSError:
+            self._cwd = None
+            raise
+        self._cwd = dir
 
     def _is_file(self, dir: str, file_name: str) -> bool:
         """Checks if object is a file or directory."""
-        file_data = self.connection.lstat(f"{dir}/{file_name}")
+        file_data = self.connection.lstat(_rjoin(dir, file_name))
         if file_data.st_mode is not None and stat.filemode(file_data.st_mode)[0] == "-":
             return True
         else:
             return False
 
     def close(self):
-        """Closes connection to server."""
+        """
+        Closes SFTP session. The SSH transport it was opened on is closed if
+        no other client is using it.
+        """
         self.connection.close()
+        self._cwd = None
+        self._release_ssh()
 
-    def fetch_file(self, file: FileInfo, dir: str) -> File:
+    def _release_ssh(self) -> None:
+        """
+        Stops using the shared SSH transport opened by `_connect_to_server`.
+        The transport is closed if no other client is using it.
+        """
+        if self._ssh_key is None:
+            return
+        with self._shared_ssh_lock:
+            ssh, users = self._shared_ssh.get(self._ssh_key, (None, 0))
+            if ssh is self._ssh and users > 1:
+                self._shared_ssh[self._ssh_key] = (ssh, users - 1)
+            else:
+                if ssh is self._ssh:
+                    del self._shared_ssh[self._ssh_key]
+                self._ssh.close()
+        self._ssh_key = None
+
+    @_reconnecting
+    def fetch_file(
+        self, file: FileInfo, dir: str, sink: Optional[BinaryIO] = None
+    ) -> File:
         """
         Retrieves file from `dir` on server as `File` object. The returned
         `File` object contains the file's content as an `io.BytesIO` object
         in the `File.file_stream` attribute and the file's metadata in the other
-        attributes.
+        attributes. Reads are prefetched using the size of `file` so that the
+        server is not asked for the file's size before it is read. No more
+        than `prefetch_requests` reads of `request_size` bytes are outstanding
+        at a time. The `io.BytesIO` object is allocated using the size of the
+        file so that it does not need to be resized as data is received. Files
+        larger than `spill_threshold` are fetched to a temporary file instead.
+        If `sink` is given, the file's content is written to it as it is
+        received and it is used as the returned `File.file_stream`. If the
+        file on the server is now smaller than the size of `file`, paramiko
+        raises `EOFError` for the reads past its end and `RetrieverFileError`
+        is raised.
 
         Args:
             file:
@@ -498,6 +1850,9 @@ class _sftpClient(_BaseClient):
                 file is fetched based on `file_name` attribute.
             dir:
                 directory on server to fetch file from
+            sink:
+                optional binary file object opened for writing to stream the
+                file's content to, eg. a file on local disk
 
         Returns:
             `File` object representing content and metadata of fetched file
@@ -507,20 +1862,65 @@ class _sftpClient(_BaseClient):
 
         """
         try:
-            self._check_dir(dir)
-            fh = io.BytesIO()
-            self.connection.getfo(remotepath=file.file_name, fl=fh)
+            if sink is None:
+                fh = _new_stream(file.file_size, self.spill_threshold)
+            else:
+                fh = sink
+            with self.connection.open(_rjoin(dir, file.file_name), "rb") as fr:
+                fr.MAX_REQUEST_SIZE = self.request_size
+                fr.prefetch(
+                    file.file_size, max_concurrent_requests=self.prefetch_requests
+                )
+                while chunk := fr.read(self.blocksize):
+                    _write_all(fh, chunk)
+            if sink is None:
+                fh.truncate()
             fetched_file = File.from_fileinfo(file=file, file_stream=fh)
             return fetched_file
+        except EOFError as e:
+            if self._connection_lost():
+                raise
+            logger.error(
+                "(%s) Unable to retrieve %s from %s. File is smaller than "
+                "expected: %s",
+                self.name,
+                file.file_name,
+                dir,
+                e,
+            )
+            raise RetrieverFileError
         except OSError as e:
             logger.error(
-                f"({self.name}) Unable to retrieve {file.file_name} from {dir}: {e}"
+                "(%s) Unable to retrieve %s from %s: %s",
+                self.name,
+                file.file_name,
+                dir,
+                e,
             )
             raise RetrieverFileError
 
+    def _get_files_data(self, file_names: list[str], dir: str) -> list[FileInfo]:
+        """
+        Retrieves metadata for each file in `file_names` in `dir` on server.
+        When metadata for more than one file is needed, `dir` is listed with a
+        single `listdir_attr` request rather than calling `stat` for each file.
+        Files missing from the listing are still looked up with `stat`.
+        """
+        if len(file_names) < 2:
+            return super()._get_files_data(file_names, dir)
+        listing = {i.file_name: i for i in self.list_file_data(dir)}
+        return [
+            listing[i] if i in listing else self.get_file_data(file_name=i, dir=dir)
+            for i in file_names
+        ]
+
+    @_reconnecting
     def get_file_data(self, file_name: str, dir: str) -> FileInfo:
         """
-        Retrieves metadata for file on server.
+        Retrieves metadata for file on server. If `dir` was listed with
+        `list_file_data` less than `cache_ttl` seconds ago and the file was
+        included in the listing, the cached metadata is returned without
+        a request to the server.
 
         Args:
             file_name: name of file to retrieve metadata for
@@ -532,10 +1932,12 @@ class _sftpClient(_BaseClient):
         Raises:
             OSError: if file or `dir` does not exist
         """
+        cached = self._cached_listing(dir)
+        if cached is not None and file_name in cached:
+            return copy.copy(cached[file_name])
         try:
-            self._check_dir(dir)
             return FileInfo.from_stat_data(
-                data=self.connection.stat(file_name), file_name=file_name
+                data=self.connection.stat(_rjoin(dir, file_name)), file_name=file_name
             )
         except OSError:
             raise RetrieverFileError
@@ -553,9 +1955,12 @@ class _sftpClient(_BaseClient):
         else:
             return True
 
+    @_reconnecting
     def list_file_data(self, dir: str) -> list[FileInfo]:
         """
-        Retrieves metadata for each file in `dir` on server.
+        Retrieves metadata for each file in `dir` on server. The metadata is
+        cached for `cache_ttl` seconds and returned by repeat calls for `dir`
+        and by `get_file_data` and `list_file_names`.
 
         Args:
             dir: directory on server to interact with
@@ -567,16 +1972,26 @@ class _sftpClient(_BaseClient):
         Raises:
             OSError: if `dir` does not exist
         """
+        cached = self._cached_listing(dir)
+        if cached is not None:
+            return [copy.copy(i) for i in cached.values()]
         try:
             file_metadata = self.connection.listdir_attr(dir)
-            return [FileInfo.from_stat_data(data=i) for i in file_metadata]
+            return self._cache_listing(
+                dir, [FileInfo.from_stat_data(data=i) for i in file_metadata]
+            )
         except OSError as e:
-            logger.error(f"({self.name}) Unable to retrieve file list from {dir}: {e}")
+            logger.error(
+                "(%s) Unable to retrieve file list from %s: %s", self.name, dir, e
+            )
             raise RetrieverFileError
 
+    @_reconnecting
     def list_file_names(self, dir: str) -> list[str]:
         """
-        Retrieves names of all files in `dir` on server.
+        Retrieves names of all files in `dir` on server. If `dir` was listed
+        with `list_file_data` less than `cache_ttl` seconds ago, the names are
+        taken from the cached listing.
 
         Args:
             dir: directory on server to interact with
@@ -588,18 +2003,28 @@ class _sftpClient(_BaseClient):
         Raises:
             OSError: if `dir` does not exist
         """
+        cached = self._cached_listing(dir)
+        if cached is not None:
+            return list(cached)
         try:
             return self.connection.listdir(dir)
         except OSError as e:
-            logger.error(f"({self.name}) Unable to retrieve file list from {dir}: {e}")
+            logger.error(
+                "(%s) Unable to retrieve file list from %s: %s", self.name, dir, e
+            )
             raise RetrieverFileError
 
-    def write_file(self, file: File, dir: str, remote: bool) -> FileInfo:
+    def write_file(
+        self, file: File, dir: str, remote: bool, refresh: bool = True
+    ) -> FileInfo:
         """
         Writes file to directory. If `remote` is True, then file is written
         to `dir` on server. If `remote` is False, then file is written to local
         directory. Retrieves metadata for file after is has been written
-        and returns metadata as `FileInfo`.
+        and returns metadata as `FileInfo`. Files written to the server are
+        sent from the buffer of `File.file_stream` without being copied into
+        intermediate chunks. Writes are not retried if the connection to the
+        server is lost.
 
         Args:
             file:
@@ -610,6 +2035,10 @@ class _sftpClient(_BaseClient):
             remote:
                 bool indicating if file should be written to remote or local
                 directory
+            refresh:
+                whether to retrieve metadata for a file written to the server
+                from the server. if False, the size of `File.file_stream` and
+                the current time are returned instead, saving a round trip.
 
         Returns:
             `FileInfo` object representing written file
@@ -620,27 +2049,36 @@ class _sftpClient(_BaseClient):
         file.file_stream.seek(0)
         if remote:
             try:
-                self._check_dir(dir)
-                written_file = self.connection.putfo(
-                    file.file_stream,
-                    remotepath=file.file_name,
-                )
+                path = _rjoin(dir, file.file_name)
+                self._drop_listing(dir)
+                with self.connection.open(path, "wb", bufsize=0) as fr:
+                    fr.set_pipelined(True)
+                    _write_stream(file.file_stream, fr.write, self.blocksize)
+                if not refresh:
+                    return _written_file_info(file)
+                written_file = self.connection.stat(path)
                 return FileInfo.from_stat_data(written_file, file_name=file.file_name)
             except OSError as e:
                 logger.error(
-                    f"({self.name}) Unable to write {file.file_name} "
-                    f"to remote directory: {e}"
+                    "(%s) Unable to write %s to remote directory: %s",
+                    self.name,
+                    file.file_name,
+                    e,
                 )
                 raise RetrieverFileError
         else:
             try:
-                local_file = f"{dir}/{file.file_name}"
-                with open(local_file, "wb") as lf:
-                    lf.write(file.file_stream.getbuffer())
-                return FileInfo.from_stat_data(os.stat(local_file), file.file_name)
+                local_file = os.path.join(dir, file.file_name)
+                with open(local_file, "wb", buffering=0) as lf:
+                    _write_local(file.file_stream, lf, self.blocksize)
+                    return FileInfo.from_stat_data(
+                        os.fstat(lf.fileno()), file.file_name
+                    )
             except OSError as e:
                 logger.error(
-                    f"({self.name}) Unable to write {file.file_name} "
-                    f"to local directory: {e}"
+                    "(%s) Unable to write %s to local directory: %s",
+                    self.name,
+                    file.file_name,
+                    e,
                 )
                 raise RetrieverFileError
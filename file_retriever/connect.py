@@ -5,7 +5,7 @@ sftp client to interact with remote storage.
 
 import logging
 import os
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Union
 from file_retriever._clients import _ftpClient, _sftpClient
 from file_retriever.file import FileInfo, File
 from file_retriever.errors import RetrieverFileError
@@ -27,6 +27,8 @@ class Client:
         password: str,
         host: str,
         port: Union[str, int],
+        cache_ttl: Optional[float] = None,
+        max_workers: int = 4,
     ):
         """Initializes client instance.
 
@@ -42,11 +44,22 @@ class Client:
                 server address
             port:
                 port number for server. 21 for FTP, 22 for SFTP
+            cache_ttl:
+                number of seconds directory listings retrieved with
+                `list_file_info` are reused by `check_file`, `get_file_info`
+                and repeat calls to `list_file_info`. listings are not cached
+                by default.
+            max_workers:
+                maximum number of connections to server used by `get_files`
+                and `put_files` to transfer files concurrently
         """
         self.name = name
         self.host = host
         self.port = port
+        self.max_workers = max_workers
         self.session = self.__connect_to_server(username=username, password=password)
+        if cache_ttl is not None:
+            self.session.cache_ttl = cache_ttl
 
     def __connect_to_server(
         self, username: str, password: str
@@ -107,7 +120,9 @@ class Client:
         If `remote` is the directory will be checked on the server connected
         to via self.session, otherwise the local directory will be checked for
         the file. Returns True if file with same name and size as `file` exists
-        in `dir`, otherwise False.
+        in `dir`, otherwise False. If `cache_ttl` was given and `dir` on the
+        server was recently listed with `list_file_info`, the file is checked
+        against the cached listing without a request to the server.
 
         Args:
             file_name: file to check for as `FileInfo` object
@@ -129,7 +144,45 @@ class Client:
             except RetrieverFileError:
                 return False
         else:
-            return os.path.exists(f"{dir}/{file.file_name}")
+            return os.path.exists(os.path.join(dir, file.file_name))
+
+    def check_files(
+        self, files: Sequence[FileInfo], dir: str, remote: bool
+    ) -> Dict[str, bool]:
+        """
+        Checks if each file (represented as `FileInfo` object) in `files`
+        exists in `dir`. If `remote` is True, `dir` on the server is listed
+        once and every file is checked against the listing rather than
+        retrieving metadata for each file separately. Otherwise the local
+        directory is checked for each file as in `check_file`.
+
+        Results are keyed by file name so files in `files` with the same name
+        share one entry. If their sizes differ, the entry is the result for
+        the last of them.
+
+        Args:
+            files: files to check for as `FileInfo` objects
+            dir: directory to check for files
+            remote: whether to check for files on server (True) or locally (False)
+
+        Returns:
+            dict mapping the name of each file in `files` to a bool indicating
+            if a file with the same name and size exists in `dir`
+        """
+        if not remote:
+            return {
+                i.file_name: os.path.exists(os.path.join(dir, i.file_name))
+                for i in files
+            }
+        try:
+            listing = {i.file_name: i for i in self.session.list_file_data(dir=dir)}
+        except RetrieverFileError:
+            listing = {}
+        return {
+            i.file_name: i.file_name in listing
+            and listing[i.file_name].file_size == i.file_size
+            for i in files
+        }
 
     def get_file(self, file: FileInfo, remote_dir: str) -> File:
         """
@@ -144,6 +197,23 @@ class Client:
         """
         return self.session.fetch_file(file=file, dir=remote_dir)
 
+    def get_files(self, files: List[FileInfo], remote_dir: str) -> List[File]:
+        """
+        Fetches multiple files from a server concurrently using up to
+        `max_workers` connections.
+
+        Args:
+            files: files represented as `FileInfo` objects
+            remote_dir: directory on server to fetch files from
+
+        Returns:
+            files fetched from `remote_dir` as `File` objects in the same order
+            as `files`
+        """
+        return self.session.fetch_files(
+            files=list(files), dir=remote_dir, workers=self.max_workers
+        )
+
     def get_file_info(self, file_name: str, remote_dir: str) -> FileInfo:
         """
         Retrieves metadata for a file on server.
@@ -163,6 +233,32 @@ class Client:
             )
             raise e
 
+    def get_files_info(self, file_names: List[str], remote_dir: str) -> List[FileInfo]:
+        """
+        Retrieves metadata for multiple files on server. `remote_dir` is listed
+        once and metadata for each file is taken from the listing. Metadata is
+        only requested separately for files not found in the listing.
+
+        Args:
+            file_names: names of files to retrieve metadata for
+            remote_dir: directory on server to interact with
+
+        Returns:
+            files in `remote_dir` represented as `FileInfo` objects in the same
+            order as `file_names`
+        """
+        listing = {
+            i.file_name: i for i in self.session.list_file_data(dir=remote_dir)
+        }
+        return [
+            (
+                listing[i]
+                if i in listing
+                else self.get_file_info(file_name=i, remote_dir=remote_dir)
+            )
+            for i in file_names
+        ]
+
     def is_file(self, file_name: str, remote_dir: str) -> bool:
         """
         Checks if file exists in directory on server.
@@ -178,7 +274,10 @@ class Client:
 
     def list_file_info(self, remote_dir: str) -> List[FileInfo]:
         """
-        Lists metadata for each file in a directory on server.
+        Lists metadata for each file in a directory on server. If `cache_ttl`
+        was given, the listing is cached by the session and reused by
+        `check_file` and `get_file_info` until it expires or a file is written
+        to `remote_dir`.
 
         Args:
             remote_dir:
@@ -241,3 +340,61 @@ class Client:
         else:
             logger.debug(f"({self.name}) Writing {file.file_name} to `{dir}`")
             return self.session.write_file(file=file, dir=dir, remote=remote)
+
+    def put_files(
+        self,
+        files: List[File],
+        dir: str,
+        remote: bool,
+        check: bool,
+    ) -> List[Optional[FileInfo]]:
+        """
+        Writes multiple files to directory. Files written to `dir` on server
+        are transferred concurrently using up to `max_workers` connections.
+
+        Args:
+            files:
+                files as `File` objects
+            dir:
+                directory to write files to
+            remote:
+                bool indicating if files should be written to remote or local
+                storage. see `put_file`.
+            check:
+                bool indicating if directory should be checked before writing
+                files. If True, `dir` is checked once with `check_files` and
+                files matching the file_name and file_size of a file in `dir`
+                are not written.
+
+        Returns:
+            `FileInfo` objects representing written files in the same order as
+            `files`. None is returned in place of files that were not written.
+        """
+        if check:
+            exists = self.check_files(files=files, dir=dir, remote=remote)
+        else:
+            exists = {}
+        to_write = []
+        for file in files:
+            if exists.get(file.file_name) is True:
+                logger.debug(
+                    f"({self.name}) {file.file_name} already exists in `{dir}`. "
+                    f"Skipping copy."
+                )
+            else:
+                logger.debug(f"({self.name}) Writing {file.file_name} to `{dir}`")
+                to_write.append(file)
+        if remote:
+            written = self.session.write_files(
+                files=to_write, dir=dir, workers=self.max_workers
+            )
+        else:
+            written = [
+                self.session.write_file(file=file, dir=dir, remote=False)
+                for file in to_write
+            ]
+        results = iter(written)
+        return [
+            None if exists.get(file.file_name) is True else next(results)
+            for file in files
+        ]
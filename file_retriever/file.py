@@ -1,15 +1,116 @@
 """This module contains classes to store file metadata and content."""
 
-import datetime
+import calendar
 import io
 import os
-import paramiko
-from typing import Optional, Union
+import stat
+from typing import TYPE_CHECKING, BinaryIO, Optional, Union, cast
+
+if TYPE_CHECKING:
+    import paramiko
+
+
+def _parse_mdtm_time(mdtm_time: str, /) -> int:
+    """parse date formatted as string (YYYYMMDDHHMMSS) to int timestamp."""
+    return calendar.timegm(
+        (
+            int(mdtm_time[0:4]),
+            int(mdtm_time[4:6]),
+            int(mdtm_time[6:8]),
+            int(mdtm_time[8:10]),
+            int(mdtm_time[10:12]),
+            int(mdtm_time[12:14]),
+            0,
+            0,
+            0,
+        )
+    )
+
+
+def _parse_mlsd_line(line: str, /) -> tuple[str, dict[str, str]]:
+    """
+    parse a line returned by an `MLSD` or `MLST` command
+    (eg. 'type=file;size=1;modify=20240101010000; foo.mrc') to the name of
+    the file and a dict of its facts. Fact names are converted to lowercase.
+    """
+    facts_found, _, name = line.rstrip("\r\n").partition(" ")
+    facts = {}
+    for fact in facts_found[:-1].split(";"):
+        key, _, value = fact.partition("=")
+        facts[key.lower()] = value
+    return name, facts
+
+
+def _parse_permissions(file_mode: str, /) -> int:
+    """
+    parse permissions written as string in symbolic notation
+    (eg. -rwxrwxrwx) to decimal value.
+
+    file_mode:
+        a 10 character string representing the permissions associated with
+        a file. The first character represents the file type, the next 9
+        characters represent the owner, group, and public permissions.
+            eg. '-rwxrw-r--'
+        this string is parsed calculate the file's permission mode in
+        decimal notation using the following formula:
+            digit 1 (filetype):
+                the first character is converted to an octal value based
+                on the type:
+                    d -> 4 (directory)
+                    - -> 1 (file)
+            digits 2-10 (permissions by group):
+                within each group (2-4: owner, 5-7: group, and 8-10: public),
+                each digit is converted to an octal value:
+                    r -> 4 (read)
+                    w -> 2 (write)
+                    x -> 1 (execute)
+                    - -> 0 (no permission)
+                the octal values for each group of 3 characters are then added
+                    'rwxrwxrwx' -> '(4+2+1) (4+2+1) (4+2+1)' -> 777
+            the octal values of the file type and permissions are then converted
+            to a decimal value using the following formula:
+                (filetype * 8^5) + (0 * 8^4) + (0 * 8^3) + (owner * 8^2) +
+                (group * 8^1) + (others * 8^0) = decimal value
+                example:
+                    '-rwxrw-r--' -> 100764
+                    (1 * 8^5) + (0 * 8^4) + (0 * 8^3) +
+                    (7 * 8^2) + (6 * 8^1) + (4 * 8^0) = 33264
+    """
+    file_type = file_mode[0].replace("d", "4").replace("-", "1")
+    file_perm = (
+        file_mode[1:10]
+        .replace("-", "0")
+        .replace("r", "4")
+        .replace("w", "2")
+        .replace("x", "1")
+    )
+    return (
+        (int(file_type) * 8**5)
+        + (0 * 8**4)
+        + (0 * 8**3)
+        + (int(int(file_perm[0]) + int(file_perm[1]) + int(file_perm[2])) * 8**2)
+        + (int(int(file_perm[3]) + int(file_perm[4]) + int(file_perm[5])) * 8**1)
+        + (int(int(file_perm[6]) + int(file_perm[7]) + int(file_perm[8])) * 8**0)
+    )
 
 
 class FileInfo:
     """A class to store file metadata."""
 
+    # metadata is stored in slots so that no `__dict__` is allocated for each
+    # file. `file_stream` is set by `File` and may be attached to a `FileInfo`
+    # object by callers writing a file.
+    __slots__ = (
+        "file_name",
+        "file_size",
+        "file_uid",
+        "file_gid",
+        "file_atime",
+        "file_mtime",
+        "file_mode",
+        "file_stream",
+    )
+
     def __init__(
         self,
         file_name: str,
@@ -46,12 +147,12 @@ class FileInfo:
         self.file_gid = file_gid
         self.file_atime = file_atime
         if isinstance(file_mtime, str):
-            self.file_mtime = self.__parse_mdtm_time(file_mtime)
+            self.file_mtime = _parse_mdtm_time(file_mtime)
         else:
             self.file_mtime = int(file_mtime)
 
         if isinstance(file_mode, str):
-            self.file_mode = self.__parse_permissions(file_mode)
+            self.file_mode = _parse_permissions(file_mode)
         elif file_mode is None:
             self.file_mode = 0
         else:
@@ -60,7 +161,7 @@ class FileInfo:
     @classmethod
     def from_stat_data(
         cls,
-        data: Union[os.stat_result, paramiko.SFTPAttributes],
+        data: Union[os.stat_result, "paramiko.SFTPAttributes"],
         file_name: Optional[str] = None,
     ) -> "FileInfo":
         """
@@ -79,25 +180,19 @@ class FileInfo:
         match data, file_name:
             case data, file_name if file_name is not None:
                 file_name = file_name
-            case data, None if isinstance(data, paramiko.SFTPAttributes) and hasattr(
-                data, "filename"
-            ) and data.filename is not None:
-                file_name = data.filename
-            case data, None if isinstance(data, paramiko.SFTPAttributes) and hasattr(
-                data, "longname"
-            ) and data.longname is not None:
-                file_name = data.longname[56:]
+            case data, None if getattr(data, "filename", None) is not None:
+                file_name = cast("paramiko.SFTPAttributes", data).filename
+            case data, None if getattr(data, "longname", None) is not None:
+                file_name = cast("paramiko.SFTPAttributes", data).longname[56:]
             case _:
                 raise AttributeError("No filename provided")
 
         match data.st_mode:
             case data.st_mode if isinstance(data.st_mode, int):
                 st_mode: Union[str, int] = data.st_mode
-            case data.st_mode if isinstance(
-                data, paramiko.SFTPAttributes
-            ) and data.st_mode is None and hasattr(
-                data, "longname"
-            ) and data.longname is not None:
+            case data.st_mode if data.st_mode is None and getattr(
+                data, "longname", None
+            ) is not None:
                 st_mode = data.longname[0:10]
             case _:
                 raise AttributeError("No file mode provided")
@@ -126,77 +221,77 @@ class FileInfo:
             file_atime=data.st_atime,
         )
 
-    def __parse_mdtm_time(self, mdtm_time: str) -> int:
-        """parse date formatted as string (YYYYMMDDHHMMSS) to int timestamp."""
-        return int(
-            datetime.datetime.strptime(mdtm_time, "%Y%m%d%H%M%S")
-            .replace(tzinfo=datetime.timezone.utc)
-            .timestamp()
-        )
+    @classmethod
+    def from_mlsd_line(cls, line: str) -> "FileInfo":
+        """
+        Creates a `FileInfo` object from a line returned by an FTP server in
+        response to an `MLSD` or `MLST` command.
+
+        Args:
+            line: line containing facts and name of file
+
+        Returns:
+            `FileInfo` object
 
-    def __parse_permissions(self, file_mode: str) -> int:
+        Raises:
+            ValueError: if facts do not include the size or modification time
         """
-        parse permissions written as string in symbolic notation
-        (eg. -rwxrwxrwx) to decimal value.
-
-        file_mode:
-            a 10 character string representing the permissions associated with
-            a file. The first character represents the file type, the next 9
-            characters represent the owner, group, and public permissions.
-                eg. '-rwxrw-r--'
-            this string is parsed calculate the file's permission mode in
-            decimal notation using the following formula:
-                digit 1 (filetype):
-                    the first character is converted to an octal value based
-                    on the type:
-                        d -> 4 (directory)
-                        - -> 1 (file)
-                digits 2-10 (permissions by group):
-                    within each group (2-4: owner, 5-7: group, and 8-10: public),
-                    each digit is converted to an octal value:
-                        r -> 4 (read)
-                        w -> 2 (write)
-                        x -> 1 (execute)
-                        - -> 0 (no permission)
-                    the octal values for each group of 3 characters are then added
-                        'rwxrwxrwx' -> '(4+2+1) (4+2+1) (4+2+1)' -> 777
-                the octal values of the file type and permissions are then converted
-                to a decimal value using the following formula:
-                    (filetype * 8^5) + (0 * 8^4) + (0 * 8^3) + (owner * 8^2) +
-                    (group * 8^1) + (others * 8^0) = decimal value
-                    example:
-                        '-rwxrw-r--' -> 100764
-                        (1 * 8^5) + (0 * 8^4) + (0 * 8^3) +
-                        (7 * 8^2) + (6 * 8^1) + (4 * 8^0) = 33264
+        file_name, facts = _parse_mlsd_line(line)
+        return cls.from_mlsd_facts(file_name=file_name, facts=facts)
+
+    @classmethod
+    def from_mlsd_facts(
+        cls,
+        file_name: str,
+        facts: dict[str, str],
+        file_mode: Union[str, int, None] = None,
+    ) -> "FileInfo":
         """
-        file_type = file_mode[0].replace("d", "4").replace("-", "1")
-        file_perm = (
-            file_mode[1:10]
-            .replace("-", "0")
-            .replace("r", "4")
-            .replace("w", "2")
-            .replace("x", "1")
-        )
-        return (
-            (int(file_type) * 8**5)
-            + (0 * 8**4)
-            + (0 * 8**3)
-            + (int(int(file_perm[0]) + int(file_perm[1]) + int(file_perm[2])) * 8**2)
-            + (int(int(file_perm[3]) + int(file_perm[4]) + int(file_perm[5])) * 8**1)
-            + (int(int(file_perm[6]) + int(file_perm[7]) + int(file_perm[8])) * 8**0)
+        Creates a `FileInfo` object from the facts returned for a file by an
+        FTP server in response to an `MLSD` or `MLST` command. Fact names are
+        expected to be lowercase as they are in the dicts yielded by
+        `ftplib.FTP.mlsd`. The `size` and `modify` facts are optional in
+        RFC 3659 but are required here. If the `unix.mode` fact is not
+        included, `file_mode` is used instead. If neither is available,
+        `file_mode` is 0 as it is for other files without permissions.
+
+        Args:
+            file_name: name of file
+            facts: dict of facts returned by server for file
+            file_mode: file permissions to use if facts do not include them
+
+        Returns:
+            `FileInfo` object
+
+        Raises:
+            ValueError: if facts do not include the size or modification time
+        """
+        if "size" not in facts or "modify" not in facts:
+            raise ValueError(f"No file size or modification time for {file_name}")
+        if "unix.mode" in facts:
+            file_mode = stat.S_IFREG | int(facts["unix.mode"], 8)
+        return cls(
+            file_name=file_name,
+            file_mtime=facts["modify"][:14],
+            file_mode=file_mode,
+            file_size=int(facts["size"]),
+            file_uid=int(facts["unix.uid"]) if "unix.uid" in facts else None,
+            file_gid=int(facts["unix.gid"]) if "unix.gid" in facts else None,
         )
 
 
 class File(FileInfo):
     """A class to store file metadata and data stream."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         file_name: str,
         file_mtime: Union[float, str],
         file_mode: Union[str, int, None],
         file_size: int,
-        file_stream: io.BytesIO,
+        file_stream: Union[io.BytesIO, BinaryIO],
         file_uid: Optional[int] = None,
         file_gid: Optional[int] = None,
         file_atime: Optional[float] = None,
@@ -205,7 +300,8 @@ class File(FileInfo):
 
         File metadata includes attributes inherited from `FileInfo` class.
         The `file_stream` attribute is a `io.BytesIO` object containing the
-        content of the file.
+        content of the file. Large files may instead be stored in a temporary
+        file on disk, in which case `file_stream` is a binary file object.
 
         Args:
 
@@ -213,7 +309,7 @@ class File(FileInfo):
             file_mtime: file modification time
             file_mode: file permissions
             file_size: file size
-            file_stream: file stream as `io.BytesIO`
+            file_stream: file stream as `io.BytesIO` or binary file object
             file_uid: file owner user id
             file_gid: file owner group id
             file_atime: file access time
@@ -230,13 +326,15 @@ class File(FileInfo):
         self.file_stream = file_stream
 
     @classmethod
-    def from_fileinfo(cls, file: FileInfo, file_stream: io.BytesIO) -> "File":
+    def from_fileinfo(
+        cls, file: FileInfo, file_stream: Union[io.BytesIO, BinaryIO]
+    ) -> "File":
         """
         Creates a `File` object from a `FileInfo` object and a file stream.
 
         Args:
             file: `FileInfo` object
-            file_stream: file stream as `io.BytesIO`
+            file_stream: file stream as `io.BytesIO` or binary file object
 
         Returns:
             `File` object
@@ -8,6 +8,7 @@ import yaml
 import pytest
 from file_retriever.connect import Client
 from file_retriever.file import FileInfo
+from file_retriever._clients import _ftpClient, _sftpClient
 
 
 @pytest.fixture(autouse=True)
@@ -15,6 +16,14 @@ def set_caplog_level(caplog):
     caplog.set_level("DEBUG")
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_connections():
+    yield
+    _ftpClient.drain_pool()
+    _sftpClient._shared_ssh.clear()
+    _sftpClient._key_file = None
+
+
 class FakeUtcNow(datetime.datetime):
     @classmethod
     def now(cls, tz=datetime.timezone.utc):
@@ -60,15 +69,61 @@ def mock_file_info():
 @pytest.fixture
 def mock_open_file(mocker):
     m = mocker.mock_open()
+    m.return_value.write.side_effect = len
     mocker.patch("builtins.open", m)
     return m
 
 
+class MockSocket:
+    """Mock data connection opened by FTP server"""
+
+    def __init__(self, data: bytes = b""):
+        self.data = data
+        self.options: Dict[tuple, int] = {}
+        self.sent: List[bytes] = []
+
+    def close(self, *args, **kwargs) -> None:
+        pass
+
+    def recv(self, bufsize: int) -> bytes:
+        data, self.data = self.data[:bufsize], self.data[bufsize:]
+        return data
+
+    def recv_into(self, buffer, nbytes: int = 0) -> int:
+        data = self.recv(min(nbytes or len(buffer), len(buffer)))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def sendall(self, data: bytes) -> None:
+        self.sent.append(bytes(data))
+
+    def sendfile(self, file, offset: int = 0, count: Optional[int] = None) -> int:
+        data = file.read()
+        self.sent.append(data)
+        return len(data)
+
+    def setsockopt(self, level: int, option: int, value: int) -> None:
+        self.options[(level, option)] = value
+
+
+class MockControlSocket(MockSocket):
+    """Mock control connection to FTP server"""
+
+    def __init__(self):
+        super().__init__()
+        self.commands: List[str] = []
+
+    def sendall(self, data: bytes) -> None:
+        self.commands.extend(data.decode().splitlines())
+
+
 class MockFTP:
     """Mock response from FTP server for a successful login"""
 
     def __init__(self, *args, **kwargs):
         self.host = "ftp.testvendor.com"
+        self.encoding = "utf-8"
+        self.sock = MockControlSocket()
 
     def close(self, *args, **kwargs) -> None:
         pass
@@ -79,6 +134,12 @@ class MockFTP:
     def cwd(self, pathname) -> str:
         return pathname
 
+    def getresp(self, *args, **kwargs) -> str:
+        return self.voidcmd(self.sock.commands.pop(0))
+
+    def getwelcome(self, *args, **kwargs) -> str:
+        return "220 (vsFTPd 3.0.5)"
+
     def login(self, *args, **kwargs) -> None:
         pass
 
@@ -88,29 +149,83 @@ class MockFTP:
     def pwd(self, *args, **kwargs) -> str:
         return "/"
 
-    def retrbinary(self, *args, **kwargs) -> bytes:
-        file = b"00000"
-        return args[1](file)
-
-    def retrlines(self, *args, **kwargs) -> str:
-        files = "-rw-r--r--    1 0        0          140401 Jan  1 00:01 foo.mrc"
-        return args[1](files)
+    def sendcmd(self, cmd: str) -> str:
+        if cmd == "FEAT":
+            return (
+                "211-Features:\n MDTM\n MLST type*;size*;modify*;UNIX.mode*;\n"
+                " SIZE\n211 End"
+            )
+        elif cmd.startswith("MLST"):
+            path = cmd[5:]
+            return (
+                f"250-Listing {path}\n"
+                f" type=file;size=140401;modify=20240101010000;UNIX.mode=0644; {path}\n"
+                "250 End"
+            )
+        return self.voidcmd(cmd)
 
     def size(self, *args, **kwargs) -> int:
         return MockStatData().st_size
 
-    def storbinary(self, *args, **kwargs) -> None:
-        pass
+    def voidresp(self, *args, **kwargs) -> str:
+        return "226 Transfer complete"
+
+    def transfercmd(self, cmd, *args, **kwargs) -> MockSocket:
+        if cmd.startswith("MLSD"):
+            return MockSocket(
+                b"type=cdir;modify=20240101010000; .\r\n"
+                b"type=dir;modify=20240101010000; bar\r\n"
+                b"type=file;size=140401;modify=20240101010000;UNIX.mode=0644; foo.mrc\r\n"
+            )
+        elif cmd.startswith("RETR"):
+            return MockSocket(b"00000")
+        elif cmd.startswith("STOR"):
+            self.stored = MockSocket()
+            return self.stored
+        elif cmd.startswith("LIST"):
+            return MockSocket(
+                b"-rw-r--r--    1 0        0          140401 Jan  1 00:01 foo.mrc\r\n"
+            )
+        return MockSocket()
 
     def voidcmd(self, *args, **kwargs) -> str:
         if "MDTM" in args[0]:
             return "213 20240101010000"
+        elif "SIZE" in args[0]:
+            return f"213 {MockStatData().st_size}"
         elif "CWD" in args[0]:
             raise ftplib.error_perm
         else:
             return "200"
 
 
+class MockSFTPFile:
+    """Mock file opened on SFTP server"""
+
+    def __init__(self, data: bytes = b"00000"):
+        self.data = data
+        self.written = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def prefetch(self, *args, **kwargs) -> None:
+        pass
+
+    def read(self, size: int) -> bytes:
+        data, self.data = self.data[:size], self.data[size:]
+        return data
+
+    def set_pipelined(self, *args, **kwargs) -> None:
+        pass
+
+    def write(self, data) -> None:
+        self.written.extend(data)
+
+
 class MockSFTPClient:
     """Mock response from SFTP for a successful login"""
 
@@ -129,9 +244,6 @@ class MockSFTPClient:
     def getcwd(self) -> Optional[str]:
         return None
 
-    def getfo(self, remotepath, fl, *args, **kwargs) -> bytes:
-        return fl.write(b"00000")
-
     def lstat(self, *args, **kwargs) -> paramiko.SFTPAttributes:
         return MockStatData().sftp_attr()
 
@@ -141,17 +253,38 @@ class MockSFTPClient:
     def listdir_attr(self, *args, **kwargs) -> List[paramiko.SFTPAttributes]:
         return [MockStatData().sftp_attr()]
 
-    def putfo(self, *args, **kwargs) -> paramiko.SFTPAttributes:
-        return MockStatData().sftp_attr()
+    def open(self, *args, **kwargs) -> MockSFTPFile:
+        return MockSFTPFile()
 
     def stat(self, *args, **kwargs) -> paramiko.SFTPAttributes:
         return MockStatData().sftp_attr()
 
 
+class MockTransport:
+    """Properties for a mock paramiko.Transport object."""
+
+    def __init__(self):
+        self.default_window_size = 2097152
+        self.default_max_packet_size = 32768
+        self.sock = MockSocket()
+
+    def is_active(self) -> bool:
+        return True
+
+
 class MockSSHClient:
+    def __init__(self):
+        self.transport = MockTransport()
+
+    def close(self, *args, **kwargs) -> None:
+        pass
+
     def connect(self, *args, **kwargs) -> None:
         pass
 
+    def get_transport(self, *args, **kwargs) -> MockTransport:
+        return self.transport
+
     def load_host_keys(self, *args, **kwargs) -> None:
         pass
 
@@ -171,6 +304,7 @@ class MockSSHClient:
 @pytest.fixture
 def mock_login(monkeypatch, mock_open_file):
     monkeypatch.setattr(os, "stat", lambda *args, **kwargs: MockStatData())
+    monkeypatch.setattr(os, "fstat", lambda *args, **kwargs: MockStatData())
     monkeypatch.setattr(os.path, "isfile", lambda *args, **kwargs: True)
     monkeypatch.setattr(paramiko, "SSHClient", MockSSHClient)
     monkeypatch.setattr(datetime, "datetime", FakeUtcNow)
@@ -243,19 +377,37 @@ def mock_file_error(monkeypatch, mock_login):
         return "drw-r--r--"
 
     monkeypatch.setattr(os, "stat", mock_os_error)
+    monkeypatch.setattr(os, "fstat", mock_os_error)
     monkeypatch.setattr(stat, "filemode", mock_stat_filemode)
-    monkeypatch.setattr(MockSFTPClient, "getfo", mock_os_error)
+    monkeypatch.setattr(MockSFTPClient, "open", mock_os_error)
     monkeypatch.setattr(MockSFTPClient, "listdir", mock_os_error)
     monkeypatch.setattr(MockSFTPClient, "listdir_attr", mock_os_error)
-    monkeypatch.setattr(MockSFTPClient, "putfo", mock_os_error)
     monkeypatch.setattr(MockSFTPClient, "stat", mock_os_error)
     monkeypatch.setattr(MockFTP, "nlst", mock_ftp_error_perm)
     monkeypatch.setattr(MockFTP, "size", mock_ftp_error_perm)
-    monkeypatch.setattr(MockFTP, "retrbinary", mock_ftp_error_perm)
-    monkeypatch.setattr(MockFTP, "storbinary", mock_ftp_error_perm)
+    monkeypatch.setattr(MockFTP, "transfercmd", mock_ftp_error_perm)
+    monkeypatch.setattr(MockFTP, "sendcmd", mock_ftp_error_perm)
     monkeypatch.setattr(MockFTP, "voidcmd", mock_voidcmd)
 
 
+@pytest.fixture
+def mock_ftp_no_mlsd(monkeypatch, mock_Client):
+    transfercmd = MockFTP.transfercmd
+
+    def mock_mlsd_not_implemented(self, cmd, *args, **kwargs):
+        if cmd.startswith("MLSD"):
+            raise ftplib.error_perm("502 Command not implemented.")
+        return transfercmd(self, cmd, *args, **kwargs)
+
+    def mock_feat(self, cmd, *args, **kwargs):
+        if cmd.startswith("MLST"):
+            raise ftplib.error_perm("502 Command not implemented.")
+        return "211-Features:\n MDTM\n SIZE\n211 End"
+
+    monkeypatch.setattr(MockFTP, "transfercmd", mock_mlsd_not_implemented)
+    monkeypatch.setattr(MockFTP, "sendcmd", mock_feat)
+
+
 @pytest.fixture
 def mock_Client_in_cwd(monkeypatch, mock_Client):
     def mock_root(*args, **kwargs):
@@ -289,9 +441,9 @@ def mock_file_none_type_return(monkeypatch, mock_Client):
     def mock_none_return(*args, **kwargs):
         return None
 
-    monkeypatch.setattr(MockFTP, "retrlines", mock_none_return)
     monkeypatch.setattr(MockFTP, "size", mock_none_return)
     monkeypatch.setattr(MockFTP, "voidcmd", mock_none_return)
+    monkeypatch.setattr(MockFTP, "sendcmd", lambda *args, **kwargs: "211 End")
 
 
 @pytest.fixture
@@ -1,15 +1,29 @@
 from contextlib import nullcontext as does_not_raise
+import ftplib
 import io
 import logging
 import os
+import socket
+import subprocess
+import sys
+import tempfile
 import pytest
-from file_retriever._clients import _ftpClient, _sftpClient, _BaseClient
+from file_retriever._clients import (
+    _ftpClient,
+    _sftpClient,
+    _BaseClient,
+    _rbasename,
+    _rjoin,
+    _tune_socket,
+    _write_local,
+)
 from file_retriever.file import FileInfo, File
 from file_retriever.errors import (
     RetrieverFileError,
     RetrieverConnectionError,
     RetrieverAuthenticationError,
 )
+from tests.conftest import MockFTP, MockSFTPFile, MockSocket, MockSSHClient
 
 
 def test_BaseClient(mock_file_info):
@@ -18,6 +32,8 @@ def test_BaseClient(mock_file_info):
         name="foo", username="foo", password="bar", host="baz", port=21
     )
     assert ftp_bc.__dict__ == {"connection": None, "name": "FOO"}
+    assert ftp_bc._spawn() is None
+    assert ftp_bc._reconnect() is None
     assert ftp_bc._check_dir(dir="foo") is None
     assert ftp_bc._is_file(dir="foo", file_name="bar") is None
     assert ftp_bc.close() is None
@@ -29,6 +45,84 @@ def test_BaseClient(mock_file_info):
     assert ftp_bc.write_file(file=mock_file_info, dir="bar", remote=True) is None
 
 
+def test_clients_import_without_paramiko():
+    code = "import sys, file_retriever.connect; print('paramiko' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize(
+    "dir, expected",
+    [
+        ("foo", "foo/bar.mrc"),
+        ("foo/", "foo/bar.mrc"),
+        ("/foo/baz", "/foo/baz/bar.mrc"),
+        ("/", "/bar.mrc"),
+        ("", "bar.mrc"),
+    ],
+)
+def test_rjoin(dir, expected):
+    assert _rjoin(dir, "bar.mrc") == expected
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("foo/bar.mrc", "bar.mrc"),
+        ("/foo/baz/bar.mrc", "bar.mrc"),
+        ("bar.mrc", "bar.mrc"),
+        ("foo\\bar.mrc", "foo\\bar.mrc"),
+    ],
+)
+def test_rbasename(path, expected):
+    assert _rbasename(path) == expected
+
+
+def test_tune_socket():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        default = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        _tune_socket(sock)
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) == default
+    finally:
+        sock.close()
+
+
+def test_tune_socket_buffer_size():
+    sock = MockSocket()
+    _tune_socket(sock, 1 << 20)
+    assert sock.options[(socket.SOL_SOCKET, socket.SO_RCVBUF)] == 1 << 20
+    assert sock.options[(socket.SOL_SOCKET, socket.SO_SNDBUF)] == 1 << 20
+
+
+@pytest.mark.parametrize("spill", [True, False])
+def test_write_local(tmp_path, spill):
+    data = bytes(range(256)) * 5
+    if spill:
+        stream = tempfile.TemporaryFile()
+        stream.write(data)
+        stream.seek(0)
+    else:
+        stream = io.BytesIO(data)
+    with open(tmp_path / "foo.mrc", "wb", buffering=0) as lf:
+        _write_local(stream, lf, 100)
+    assert (tmp_path / "foo.mrc").read_bytes() == data
+
+
+def test_write_local_no_sendfile(tmp_path, mocker):
+    sendfile = mocker.patch("os.sendfile", side_effect=OSError)
+    stream = tempfile.TemporaryFile()
+    stream.write(b"00000")
+    stream.seek(0)
+    with open(tmp_path / "foo.mrc", "wb", buffering=0) as lf:
+        _write_local(stream, lf, 2)
+    assert sendfile.call_count == 1
+    assert (tmp_path / "foo.mrc").read_bytes() == b"00000"
+
+
 class TestMock_ftpClient:
     """Test the _ftpClient class with mock responses."""
 
@@ -37,6 +131,36 @@ class TestMock_ftpClient:
         ftp = _ftpClient(**stub_creds)
         assert ftp.connection is not None
 
+    @pytest.mark.parametrize(
+        "welcome, server_type",
+        [
+            ("220 (vsFTPd 3.0.5)", "vsFTPd 3.0.5"),
+            ("220 ProFTPD Server (Debian) [::ffff:1.1.1.1]", "Debian"),
+            ("220 Microsoft FTP Service", "Microsoft FTP Service"),
+        ],
+    )
+    def test_ftpClient_parse_welcome(self, welcome, server_type):
+        assert _ftpClient._parse_welcome(welcome) == server_type
+
+    def test_ftpClient_server_type(self, mock_login, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        assert ftp.server_type == "vsFTPd 3.0.5"
+        assert ftp.connection.sock.options[(socket.IPPROTO_TCP, socket.TCP_NODELAY)]
+        assert (socket.SOL_SOCKET, socket.SO_RCVBUF) not in ftp.connection.sock.options
+
+    def test_ftpClient_welcome_parsed_once(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        getwelcome = mocker.spy(ftplib.FTP, "getwelcome")
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.list_file_data(dir="bar")
+        ftp.get_file_data(file_name="foo.mrc", dir="bar")
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        ftp.write_file(file=file_obj, dir="bar", remote=True)
+        assert getwelcome.call_count == 1
+
     def test_ftpClient_no_creds(self, mock_login):
         creds = {}
         with pytest.raises(TypeError):
@@ -94,11 +218,239 @@ class TestMock_ftpClient:
         connection = ftp.close()
         assert connection is None
 
+    def test_ftpClient_close_no_pool(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        close = mocker.spy(ftp.connection, "close")
+        ftp.close()
+        close.assert_called_once()
+        assert ftp.connection is None
+        assert ftp.is_active() is False
+        assert _ftpClient._pool == {}
+
+    def test_ftpClient_closed_connection(self, mock_Client, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.close()
+        with pytest.raises(ConnectionError):
+            ftp._has_feature("MLST")
+        assert ftp.list_file_names(dir="testdir") == ["foo.mrc"]
+        assert ftp.connection is not None
+
+    def test_ftpClient_pool(self, mock_Client, stub_creds, mocker, monkeypatch):
+        stub_creds["port"] = "21"
+        monkeypatch.setattr(_ftpClient, "pool_size", 8)
+        login = mocker.spy(MockFTP, "login")
+        ftp1 = _ftpClient(**stub_creds)
+        connection = ftp1.connection
+        ftp1.close()
+        ftp1.close()
+        assert list(_ftpClient._pool.values()) == [[connection]]
+        assert stub_creds["password"] not in next(iter(_ftpClient._pool))
+        assert ftp1.is_active() is False
+        ftp2 = _ftpClient(**stub_creds)
+        assert ftp2.connection is connection
+        assert login.call_count == 1
+        ftp3 = _ftpClient(**stub_creds)
+        assert ftp3.connection is not connection
+        assert login.call_count == 2
+
+    def test_ftpClient_pool_dead_connection(
+        self, mock_Client, stub_creds, mocker, monkeypatch
+    ):
+        stub_creds["port"] = "21"
+        monkeypatch.setattr(_ftpClient, "pool_size", 8)
+        ftp1 = _ftpClient(**stub_creds)
+        connection = ftp1.connection
+        ftp1.close()
+        mocker.patch.object(connection, "voidcmd", side_effect=EOFError)
+        close = mocker.spy(connection, "close")
+        ftp2 = _ftpClient(**stub_creds)
+        assert ftp2.connection is not connection
+        close.assert_called_once()
+
+    def test_ftpClient_pool_size(self, mock_Client, stub_creds, mocker, monkeypatch):
+        stub_creds["port"] = "21"
+        monkeypatch.setattr(_ftpClient, "pool_size", 1)
+        clients = [_ftpClient(**stub_creds) for _ in range(2)]
+        close = mocker.spy(clients[1].connection, "close")
+        for client in clients:
+            client.close()
+        close.assert_called_once()
+        assert sum(len(i) for i in _ftpClient._pool.values()) == 1
+
+    def test_ftpClient_pool_unread_reply(
+        self, mock_Client, stub_creds, mocker, monkeypatch
+    ):
+        stub_creds["port"] = "21"
+        monkeypatch.setattr(_ftpClient, "pool_size", 8)
+        ftp = _ftpClient(**stub_creds)
+        mocker.patch.object(
+            ftp.connection, "voidcmd", return_value="226 Transfer complete"
+        )
+        close = mocker.spy(ftp.connection, "close")
+        ftp.close()
+        close.assert_called_once()
+        assert _ftpClient._pool == {}
+
+    def test_ftpClient_pool_not_in_home_dir(
+        self, mock_Client, stub_creds, mocker, monkeypatch
+    ):
+        stub_creds["port"] = "21"
+        monkeypatch.setattr(_ftpClient, "pool_size", 8)
+        ftp = _ftpClient(**stub_creds)
+        close = mocker.spy(ftp.connection, "close")
+        ftp._check_dir("bar")
+        ftp.close()
+        close.assert_called_once()
+        assert _ftpClient._pool == {}
+
+    def test_ftpClient_drain_pool(self, mock_Client, stub_creds, mocker, monkeypatch):
+        stub_creds["port"] = "21"
+        monkeypatch.setattr(_ftpClient, "pool_size", 8)
+        ftp = _ftpClient(**stub_creds)
+        close = mocker.spy(ftp.connection, "close")
+        ftp.close()
+        close.assert_not_called()
+        _ftpClient.drain_pool()
+        close.assert_called_once()
+        assert _ftpClient._pool == {}
+
     def test_ftpClient_fetch_file(self, mock_Client, mock_file_info, stub_creds):
         stub_creds["port"] = "21"
         ftp = _ftpClient(**stub_creds)
         fh = ftp.fetch_file(file=mock_file_info, dir="bar")
         assert fh.file_stream.getvalue()[0:1] == b"0"
+        assert fh.file_stream.getvalue() == b"00000"
+
+    def test_ftpClient_blocksize(self, mock_Client, mock_file_info, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.blocksize = 2
+        file_obj = ftp.fetch_file(file=mock_file_info, dir="bar")
+        assert file_obj.file_stream.getvalue() == b"00000"
+        ftp.write_file(file=file_obj, dir="bar", remote=True)
+        assert ftp.connection.stored.sent == [b"00000"]
+
+    @pytest.mark.parametrize("spill", [True, False])
+    def test_ftpClient_stor_from(self, mock_Client, stub_creds, mocker, spill):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        data = bytes(range(256)) * 64
+        if spill:
+            stream = tempfile.TemporaryFile()
+            stream.write(data)
+            stream.seek(0)
+        else:
+            stream = io.BytesIO(data)
+        server, client = socket.socketpair()
+        with server:
+            mocker.patch.object(ftp.connection, "transfercmd", return_value=client)
+            ftp._stor_from("foo.mrc", stream)
+            received = b""
+            while chunk := server.recv(1 << 16):
+                received += chunk
+        assert received == data
+
+    def test_ftpClient_binary_mode_set_once(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        voidcmd = mocker.spy(ftplib.FTP, "voidcmd")
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        file_obj = ftp.fetch_file(file=mock_file_info, dir="bar")
+        ftp.fetch_file(file=mock_file_info, dir="bar")
+        ftp.write_file(file=file_obj, dir="bar", remote=True)
+        ftp.write_file(file=file_obj, dir="bar", remote=True)
+        ftp.list_file_data(dir="bar")
+        assert [i.args[1] for i in voidcmd.call_args_list].count("TYPE I") == 1
+
+    @pytest.mark.parametrize("file_size", [0, 1, 5, 140401])
+    def test_ftpClient_retr_into(self, mock_Client, stub_creds, file_size):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.blocksize = 2
+        fh = ftp._retr_into("foo.mrc", file_size)
+        assert fh.getvalue() == b"00000"
+        assert fh.tell() == 5
+
+    def test_ftpClient_fetch_file_spill(
+        self, mock_Client, mock_file_info, stub_creds, mock_open_file, mocker
+    ):
+        mocker.patch("os.sendfile", side_effect=OSError)
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.spill_threshold = 2
+        ftp.blocksize = 2
+        fh = ftp.fetch_file(file=mock_file_info, dir="bar")
+        assert not isinstance(fh.file_stream, io.BytesIO)
+        assert fh.file_stream.tell() == 5
+        fh.file_stream.seek(0)
+        assert fh.file_stream.read() == b"00000"
+        ftp.write_file(file=fh, dir="bar", remote=True)
+        assert ftp.connection.stored.sent == [b"00000"]
+        ftp.write_file(file=fh, dir="bar", remote=False)
+        assert [i.args[0] for i in mock_open_file().write.call_args_list] == [
+            b"00",
+            b"00",
+            b"0",
+        ]
+
+    def test_ftpClient_fetch_file_sink(self, mock_Client, mock_file_info, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.blocksize = 2
+        sink = io.BytesIO(b"xx")
+        sink.seek(2)
+        fh = ftp.fetch_file(file=mock_file_info, dir="bar", sink=sink)
+        assert fh.file_stream is sink
+        assert sink.getvalue() == b"xx00000"
+        recv_buf = ftp._recv_buf
+        ftp.fetch_file(file=mock_file_info, dir="bar", sink=io.BytesIO())
+        assert ftp._recv_buf is recv_buf
+
+    def test_ftpClient_fetch_file_to_path(
+        self, mock_Client, mock_file_info, mock_open_file, stub_creds
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        file = ftp.fetch_file_to_path(
+            file=mock_file_info, dir="bar", local_path="baz/foo.mrc"
+        )
+        mock_open_file.assert_called_once_with("baz/foo.mrc", "wb", buffering=0)
+        assert mock_open_file.return_value.write.call_count == 1
+        assert file.file_name == "foo.mrc"
+        assert file.file_size == 140401
+
+    def test_ftpClient_fetch_file_to_path_error(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        mocker.patch("builtins.open", side_effect=OSError)
+        with pytest.raises(RetrieverFileError):
+            ftp.fetch_file_to_path(
+                file=mock_file_info, dir="bar", local_path="baz/foo.mrc"
+            )
+
+    @pytest.mark.parametrize("error", [RetrieverFileError, EOFError])
+    def test_ftpClient_fetch_file_to_path_partial(
+        self, mock_Client, mock_file_info, mock_open_file, stub_creds, mocker, error
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        remove = mocker.patch("os.remove")
+
+        def partial_transfer(file, dir, sink):
+            sink.write(b"000")
+            raise error
+
+        mocker.patch.object(ftp, "fetch_file", side_effect=partial_transfer)
+        with pytest.raises(error):
+            ftp.fetch_file_to_path(
+                file=mock_file_info, dir="bar", local_path="baz/foo.mrc"
+            )
+        remove.assert_called_once_with("baz/foo.mrc")
 
     def test_ftpClient_fetch_file_error(
         self, mock_file_error, mock_file_info, stub_creds
@@ -108,6 +460,84 @@ class TestMock_ftpClient:
             ftp = _ftpClient(**stub_creds)
             ftp.fetch_file(file=mock_file_info, dir="bar")
 
+    def test_ftpClient_fetch_files(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        spawn = mocker.spy(ftp, "_spawn")
+        files = ftp.fetch_files(files=[mock_file_info] * 6, dir="bar", workers=3)
+        assert [i.file_stream.getvalue() for i in files] == [b"00000"] * 6
+        assert spawn.call_count == 2
+
+    def test_ftpClient_spawn(self, mock_Client, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.cache_ttl = 30.0
+        ftp.blocksize = 1024
+        ftp.list_file_data(dir="testdir")
+        client = ftp._spawn()
+        assert client.connection is not ftp.connection
+        assert client.cache_ttl == 30.0
+        assert client.blocksize == 1024
+        assert client._dir_cache == {}
+        assert client._credentials == ftp._credentials
+        assert client._credentials["port"] == 21
+        assert "testdir" in ftp._dir_cache
+
+    def test_ftpClient_fetch_files_error(
+        self, mock_file_error, mock_file_info, stub_creds
+    ):
+        stub_creds["port"] = "21"
+        with pytest.raises(RetrieverFileError):
+            ftp = _ftpClient(**stub_creds)
+            ftp.fetch_files(files=[mock_file_info] * 2, dir="bar")
+
+    def test_ftpClient_fetch_files_by_name(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        sendcmd = mocker.spy(ftp.connection, "sendcmd")
+        files = ftp.fetch_files(files=["foo.mrc", "bar.mrc"], dir="bar", workers=1)
+        assert [i.file_name for i in files] == ["foo.mrc", "bar.mrc"]
+        sendcmd.assert_any_call("MLST bar/bar.mrc")
+
+    def test_ftpClient_list_file_data_many(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        spawn = mocker.spy(ftp, "_spawn")
+        files = ftp.list_file_data_many(dirs=["foo", "bar", "baz"], workers=2)
+        assert list(files) == ["foo", "bar", "baz"]
+        assert [[i.file_name for i in v] for v in files.values()] == [
+            ["foo.mrc"]
+        ] * 3
+        assert spawn.call_count == 1
+
+    def test_ftpClient_write_files(self, mock_Client, mock_file_info, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        files = [
+            File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+            for _ in range(3)
+        ]
+        written = ftp.write_files(files=files, dir="bar")
+        assert [i.file_name for i in written] == ["foo.mrc"] * 3
+
+    @pytest.mark.parametrize("method", ["fetch_files", "write_files"])
+    def test_ftpClient_workers_drop_listing(
+        self, mock_Client, mock_file_info, stub_creds, method
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.cache_ttl = 30.0
+        ftp.list_file_data(dir="bar")
+        assert ftp._cached_listing("bar") is not None
+        files = [
+            File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+            for _ in range(3)
+        ]
+        getattr(ftp, method)(files=files, dir="bar", workers=3)
+        assert ftp._cached_listing("bar") is None
+
     def test_ftpClient_get_file_data(self, mock_Client, stub_creds):
         stub_creds["port"] = "21"
         ftp = _ftpClient(**stub_creds)
@@ -120,6 +550,60 @@ class TestMock_ftpClient:
         assert file_data.file_gid is None
         assert file_data.file_atime is None
 
+    def test_ftpClient_get_file_data_baker_taylor(self, mock_ftp_no_mlsd, stub_creds):
+        stub_creds["port"] = "21"
+        stub_creds["host"] = "ftp.baker-taylor.com"
+        ftp = _ftpClient(**stub_creds)
+        file_data = ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file_data.file_name == "foo.mrc"
+        assert file_data.file_size == 140401
+        assert file_data.file_mode == 0
+
+    def test_ftpClient_get_file_data_mlst(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        sendcmd = mocker.spy(ftp.connection, "sendcmd")
+        pwd = mocker.spy(ftp.connection, "pwd")
+        file_data = ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file_data.file_size == 140401
+        assert file_data.file_mode == 33188
+        assert [i.args[0] for i in sendcmd.call_args_list] == [
+            "FEAT",
+            "MLST testdir/foo.mrc",
+            "MLST testdir/foo.mrc",
+        ]
+        pwd.assert_not_called()
+
+    def test_ftpClient_get_file_data_mlst_not_implemented(
+        self, mock_Client, stub_creds, mocker, caplog
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp._features = frozenset(["MLST"])
+        sendcmd = mocker.patch.object(
+            ftp.connection,
+            "sendcmd",
+            side_effect=ftplib.error_perm("502 Command not implemented."),
+        )
+        file_data = ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file_data.file_size == 140401
+        assert file_data.file_mode == 33188
+        assert sendcmd.call_count == 1
+        assert ftp._features == frozenset()
+        assert "MLST not supported by server" in caplog.text
+
+    def test_ftpClient_get_file_data_mlst_no_file(self, mock_Client, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp._features = frozenset(["MLST"])
+        ftp.connection.sendcmd = lambda cmd: (
+            "250-Listing bar\n type=dir;modify=20240101010000; bar\n250 End"
+        )
+        with pytest.raises(RetrieverFileError):
+            ftp.get_file_data(file_name="bar", dir="testdir")
+
     def test_ftpClient_get_file_data_error(self, mock_file_error, stub_creds):
         stub_creds["port"] = "21"
         ftp = _ftpClient(**stub_creds)
@@ -148,6 +632,261 @@ class TestMock_ftpClient:
         assert files[0].file_gid is None
         assert files[0].file_atime is None
 
+    def test_ftpClient_list_file_data_mlsd_missing_facts(
+        self, mock_Client, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        listings = {
+            "MLSD": b"type=file;modify=20240101010000; foo.mrc\r\n"
+            b"type=file;size=1; bar.mrc\r\n"
+            b"type=file;size=2;modify=20240101010000;UNIX.mode=0600; baz.mrc\r\n",
+            "LIST": b"-rw-r--r--    1 0        0     140401 Jan  1 00:01 foo.mrc\r\n"
+            b"-rwxrwxrwx    1 0        0          1 Jan  1 00:01 bar.mrc\r\n",
+        }
+        mocker.patch.object(
+            ftp.connection,
+            "transfercmd",
+            side_effect=lambda cmd: MockSocket(listings[cmd.split()[0]]),
+        )
+        sendall = mocker.spy(ftp.connection.sock, "sendall")
+        files = ftp.list_file_data(dir="testdir")
+        assert [i.file_name for i in files] == ["foo.mrc", "bar.mrc", "baz.mrc"]
+        assert [i.file_size for i in files] == [140401, 1, 2]
+        assert all(i.file_mtime == 1704070800 for i in files)
+        assert [i.file_mode for i in files] == [33188, 33279, 33152]
+        sendall.assert_called_once_with(b"MDTM testdir/bar.mrc\r\n")
+
+    def test_ftpClient_list_file_data_mlsd_missing_size(
+        self, mock_Client, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        mocker.patch.object(
+            ftp.connection,
+            "transfercmd",
+            side_effect=lambda cmd: MockSocket(
+                b"type=file;modify=20240101010000; foo.mrc\r\n"
+                if cmd.startswith("MLSD")
+                else b""
+            ),
+        )
+        mocker.patch.object(ftp.connection, "getresp", side_effect=ftplib.error_perm)
+        with pytest.raises(RetrieverFileError):
+            ftp.list_file_data(dir="testdir")
+
+    def test_ftpClient_list_file_data_no_mlsd(self, mock_ftp_no_mlsd, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        files = ftp.list_file_data(dir="testdir")
+        assert len(files) == 1
+        assert files[0].file_name == "foo.mrc"
+        assert files[0].file_mtime == 1704070800
+        assert files[0].file_size == 140401
+        assert files[0].file_mode == 33188
+
+    def test_ftpClient_list_file_data_single_list(
+        self, mock_ftp_no_mlsd, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        mocker.patch.object(
+            ftp.connection,
+            "transfercmd",
+            return_value=MockSocket(
+                b"total 3\r\n"
+                b"drwxr-xr-x    2 0        0            4096 Jan  1 00:01 bar\r\n"
+                b"-rw-r--r--    1 0        0          140401 Jan  1 00:01 foo.mrc\r\n"
+                b"-rwxrwxrwx    1 0        0          140401 Jan  1 00:01 foo bar.mrc\r\n"
+            ),
+        )
+        voidcmd = mocker.spy(ftp.connection, "voidcmd")
+        nlst = mocker.spy(ftp.connection, "nlst")
+        sendall = mocker.spy(ftp.connection.sock, "sendall")
+        files = ftp.list_file_data(dir="testdir")
+        assert [(i.file_name, i.file_mode) for i in files] == [
+            ("foo.mrc", 33188),
+            ("foo bar.mrc", 33279),
+        ]
+        ftp.connection.transfercmd.assert_called_once_with("LIST testdir")
+        sendall.assert_called_once_with(
+            b"MDTM testdir/foo.mrc\r\nMDTM testdir/foo bar.mrc\r\n"
+        )
+        assert not any(i.args[0].startswith("CWD") for i in voidcmd.call_args_list)
+        nlst.assert_not_called()
+
+    def test_ftpClient_list_file_data_not_unix_listing(
+        self, mock_ftp_no_mlsd, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        mocker.patch.object(
+            ftp,
+            "_raw_list",
+            side_effect=[["01-01-24  01:00AM               140401 foo.mrc"], []],
+        )
+        is_file = mocker.spy(ftp, "_is_file")
+        files = ftp.list_file_data(dir="testdir")
+        assert [i.file_name for i in files] == ["foo.mrc"]
+        is_file.assert_called_once_with("testdir", "foo.mrc")
+
+    def test_ftpClient_list_file_data_mlsd_not_advertised(
+        self, mock_ftp_no_mlsd, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        transfercmd = mocker.spy(ftp.connection, "transfercmd")
+        ftp.list_file_data(dir="testdir")
+        assert not any(
+            i.args[0].startswith("MLSD") for i in transfercmd.call_args_list
+        )
+
+    @pytest.mark.parametrize(
+        "resp, features",
+        [
+            (
+                "211-Features:\n MDTM\n MLST type*;size*;\n SIZE\n211 End",
+                {"MDTM", "MLST", "SIZE"},
+            ),
+            ("211 No features", set()),
+        ],
+    )
+    def test_ftpClient_has_feature(self, mock_Client, stub_creds, resp, features):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.connection.sendcmd = lambda cmd: resp
+        assert ftp._has_feature("MLST") is ("MLST" in features)
+        assert ftp._features == features
+
+    def test_ftpClient_pipelined_mdtm_size(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        sendall = mocker.spy(ftp.connection.sock, "sendall")
+        stats = ftp._pipelined_mdtm_size(["foo.mrc", "bar/bar.mrc"])
+        assert stats == [("20240101010000", 140401), ("20240101010000", 140401)]
+        sendall.assert_called_once_with(
+            b"MDTM foo.mrc\r\nSIZE foo.mrc\r\nMDTM bar/bar.mrc\r\nSIZE bar/bar.mrc\r\n"
+        )
+        assert ftp.connection.sock.commands == []
+
+    def test_ftpClient_pipelined_mdtm_size_known_sizes(
+        self, mock_Client, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        sendall = mocker.spy(ftp.connection.sock, "sendall")
+        stats = ftp._pipelined_mdtm_size(["foo.mrc", "bar.mrc"], [1, None])
+        assert stats == [("20240101010000", 1), ("20240101010000", 140401)]
+        sendall.assert_called_once_with(
+            b"MDTM foo.mrc\r\nMDTM bar.mrc\r\nSIZE bar.mrc\r\n"
+        )
+
+    def test_ftpClient_pipelined_mdtm_size_batches(
+        self, mock_Client, stub_creds, mocker, monkeypatch
+    ):
+        stub_creds["port"] = "21"
+        monkeypatch.setattr(_ftpClient, "pipeline_batch", 3)
+        ftp = _ftpClient(**stub_creds)
+        sendall = mocker.spy(ftp.connection.sock, "sendall")
+        stats = ftp._pipelined_mdtm_size(["foo.mrc", "bar.mrc"])
+        assert stats == [("20240101010000", 140401), ("20240101010000", 140401)]
+        assert sendall.call_args_list == [
+            mocker.call(b"MDTM foo.mrc\r\nSIZE foo.mrc\r\nMDTM bar.mrc\r\n"),
+            mocker.call(b"SIZE bar.mrc\r\n"),
+        ]
+
+    def test_ftpClient_pipelined_mdtm_size_error(self, mock_file_error, stub_creds):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        stats = ftp._pipelined_mdtm_size(["foo.mrc", "bar.mrc"])
+        assert stats == [(None, None), (None, None)]
+
+    def test_ftpClient_pipeline_newline(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        sendall = mocker.spy(ftp.connection.sock, "sendall")
+        with pytest.raises(ValueError):
+            ftp._pipeline(["MDTM foo.mrc\r\nDELE bar.mrc"])
+        sendall.assert_not_called()
+
+    def test_ftpClient_pipeline_no_socket(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.connection.sock = None
+        mocker.patch.object(ftp.connection, "voidcmd", side_effect=AttributeError)
+        with pytest.raises(ConnectionError):
+            ftp._pipeline(["MDTM foo.mrc"])
+        ftp._features = frozenset()
+        file = ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file.file_size == 140401
+
+    @pytest.mark.parametrize("error", [ftplib.error_reply, ftplib.error_proto])
+    def test_ftpClient_pipeline_error_reply(
+        self, mock_Client, stub_creds, mocker, error
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        mocker.patch.object(
+            ftp.connection,
+            "getresp",
+            side_effect=[error("350 foo"), "213 20240101010000"],
+        )
+        responses = ftp._pipeline(["MDTM foo.mrc", "MDTM bar.mrc"])
+        assert responses == [None, "213 20240101010000"]
+        assert ftp.connection is not None
+
+    @pytest.mark.parametrize("error", [EOFError, socket.timeout])
+    def test_ftpClient_pipeline_dropped(self, mock_Client, stub_creds, mocker, error):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        connection = ftp.connection
+        close = mocker.spy(connection, "close")
+        mocker.patch.object(connection, "getresp", side_effect=[error, "213 1"])
+        with pytest.raises(error):
+            ftp._pipeline(["MDTM foo.mrc", "MDTM bar.mrc"])
+        close.assert_called_once()
+        assert ftp.connection is None
+        assert ftp.is_active() is False
+        ftp._features = frozenset()
+        file = ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file.file_size == 140401
+        assert ftp.connection is not None
+
+    def test_ftpClient_pipeline_resync(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        connection = ftp.connection
+        getresp = connection.getresp
+        errors = [UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")]
+
+        def bad_reply():
+            reply = getresp()
+            if errors:
+                raise errors.pop()
+            return reply
+
+        mocker.patch.object(connection, "getresp", side_effect=bad_reply)
+        with pytest.raises(UnicodeDecodeError):
+            ftp._pipeline(["MDTM foo.mrc", "SIZE foo.mrc", "MDTM bar.mrc"])
+        assert ftp.connection is connection
+        assert connection.sock.commands == []
+        assert ftp._pipeline(["SIZE bar.mrc"]) == ["213 140401"]
+
+    def test_ftpClient_pipeline_resync_failed(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        connection = ftp.connection
+        mocker.patch.object(
+            connection, "getresp", side_effect=[KeyboardInterrupt, "213 1"]
+        )
+        mocker.patch.object(connection, "voidcmd", return_value="213 1")
+        with pytest.raises(KeyboardInterrupt):
+            ftp._pipeline(["MDTM foo.mrc", "MDTM bar.mrc"])
+        assert ftp.connection is None
+        ftp._features = frozenset()
+        file = ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file.file_size == 140401
+
     def test_ftpClient_list_file_data_error(self, mock_file_error, stub_creds):
         stub_creds["port"] = "21"
         ftp = _ftpClient(**stub_creds)
@@ -162,6 +901,135 @@ class TestMock_ftpClient:
         assert len(files) == 1
         assert files[0] == "foo.mrc"
 
+    def test_ftpClient_listing_cached(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp.cache_ttl = 30.0
+        transfercmd = mocker.spy(ftp.connection, "transfercmd")
+        nlst = mocker.spy(ftp.connection, "nlst")
+        files = ftp.list_file_data(dir="testdir")
+        files[0].file_size = 0
+        assert [i.file_name for i in ftp.list_file_data(dir="testdir")] == [
+            i.file_name for i in files
+        ]
+        file_data = ftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file_data is not files[0]
+        assert file_data.file_size == 140401
+        file_data.file_size = 1
+        assert ftp.list_file_data(dir="testdir")[0].file_size == 140401
+        assert ftp.list_file_names(dir="testdir") == ["foo.mrc"]
+        assert ftp.list_file_names(dir="testdir") == ["foo.mrc"]
+        assert transfercmd.call_count == 1
+        assert nlst.call_count == 1
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        ftp.write_file(file=file_obj, dir="testdir", remote=True)
+        assert "testdir" not in ftp._dir_cache
+        assert "testdir" not in ftp._name_cache
+
+    def test_ftpClient_listing_cache_expired(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        assert ftp.cache_ttl == 0
+        nlst = mocker.spy(ftp.connection, "nlst")
+        transfercmd = mocker.spy(ftp.connection, "transfercmd")
+        ftp.list_file_names(dir="testdir")
+        ftp.list_file_names(dir="testdir")
+        ftp.list_file_data(dir="testdir")
+        ftp.list_file_data(dir="testdir")
+        assert nlst.call_count == 2
+        assert transfercmd.call_count == 2
+        assert ftp._dir_cache == {}
+
+    def test_ftpClient_reconnect(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        lost = ftp.connection
+        mocker.patch.object(lost, "nlst", side_effect=EOFError)
+        mocker.patch.object(lost, "voidcmd", side_effect=EOFError)
+        assert ftp.list_file_names(dir="testdir") == ["foo.mrc"]
+        assert ftp.connection is not lost
+        assert ftp._cwd is None
+
+    def test_ftpClient_no_reconnect_if_active(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        conn = ftp.connection
+        mocker.patch.object(conn, "nlst", side_effect=EOFError)
+        with pytest.raises(EOFError):
+            ftp.list_file_names(dir="testdir")
+        assert ftp.connection is conn
+
+    def test_ftpClient_no_reconnect_file_error(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        conn = ftp.connection
+        nlst = mocker.patch.object(conn, "nlst", side_effect=ftplib.error_perm)
+        mocker.patch.object(conn, "voidcmd", side_effect=EOFError)
+        with pytest.raises(RetrieverFileError):
+            ftp.list_file_names(dir="testdir")
+        assert nlst.call_count == 1
+        assert ftp.connection is conn
+
+    def test_ftpClient_no_reconnect_positional_sink(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        conn = ftp.connection
+        retr = mocker.patch.object(conn, "transfercmd", side_effect=EOFError)
+        mocker.patch.object(conn, "voidcmd", side_effect=EOFError)
+        with pytest.raises(EOFError):
+            ftp.fetch_file(mock_file_info, "bar", io.BytesIO())
+        assert retr.call_count == 1
+        assert ftp.connection is conn
+
+    def test_ftpClient_no_reconnect_write_file(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        conn = ftp.connection
+        stor = mocker.patch.object(ftp, "_stor_from", side_effect=EOFError)
+        mocker.patch.object(conn, "voidcmd", side_effect=EOFError)
+        file = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        with pytest.raises(EOFError):
+            ftp.write_file(file=file, dir="bar", remote=True)
+        assert stor.call_count == 1
+        assert ftp.connection is conn
+
+    def test_ftpClient_write_file_dropped_connection(
+        self, mock_Client, mock_file_info, stub_creds
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp._drop_connection()
+        file = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        written = ftp.write_file(file=file, dir="bar", remote=True)
+        assert written.file_size == 140401
+        assert ftp.connection is not None
+
+    def test_ftpClient_reconnect_error_chained(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        conn = ftp.connection
+        mocker.patch.object(conn, "nlst", side_effect=EOFError)
+        mocker.patch.object(conn, "voidcmd", side_effect=EOFError)
+        mocker.patch.object(
+            ftp, "_connect_to_server", side_effect=RetrieverConnectionError
+        )
+        with pytest.raises(RetrieverConnectionError) as exc:
+            ftp.list_file_names(dir="testdir")
+        assert isinstance(exc.value.__cause__, EOFError)
+
+    def test_ftpClient_context_manager(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        close = mocker.spy(_ftpClient, "close")
+        with _ftpClient(**stub_creds) as ftp:
+            assert ftp.is_active() is True
+        close.assert_called_once()
+
     def test_ftpClient_list_file_names_error(self, mock_file_error, stub_creds):
         stub_creds["port"] = "21"
         ftp = _ftpClient(**stub_creds)
@@ -174,6 +1042,23 @@ class TestMock_ftpClient:
         live_connection = ftp.is_active()
         assert live_connection is True
 
+    def test_ftpClient_is_active_fast_path(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        voidcmd = mocker.spy(ftp.connection, "voidcmd")
+        assert ftp.is_active() is True
+        assert ftp.is_active() is True
+        ftp.fetch_file(file=mock_file_info, dir="bar")
+        assert ftp.is_active() is True
+        assert [i.args[0] for i in voidcmd.call_args_list].count("NOOP") == 1
+        ftp.idle_probe_interval = 0
+        assert ftp.is_active() is True
+        assert [i.args[0] for i in voidcmd.call_args_list].count("NOOP") == 2
+        ftp.close()
+        assert ftp._last_ok == 0.0
+
     def test_ftpClient_is_active_false(
         self, mock_Client_connection_dropped, stub_creds
     ):
@@ -182,6 +1067,15 @@ class TestMock_ftpClient:
         live_connection = ftp.is_active()
         assert live_connection is False
 
+    @pytest.mark.parametrize(
+        "error", [EOFError, ConnectionResetError, ftplib.error_temp]
+    )
+    def test_ftpClient_is_active_error(self, mock_Client, stub_creds, mocker, error):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        mocker.patch.object(ftp.connection, "voidcmd", side_effect=error)
+        assert ftp.is_active() is False
+
     def test_ftpClient_write_file(self, mock_Client, mock_file_info, stub_creds):
         stub_creds["port"] = "21"
         ftp = _ftpClient(**stub_creds)
@@ -192,9 +1086,118 @@ class TestMock_ftpClient:
         local_file = ftp.write_file(file=file_obj, dir="bar", remote=False)
         assert remote_file.file_mtime == 1704070800
         assert remote_file.file_size == 140401
+        assert remote_file.file_mode == 33188
         assert local_file.file_mtime == 1704070800
         assert local_file.file_size == 140401
 
+    def test_ftpClient_write_file_no_mlst(
+        self, mock_ftp_no_mlsd, mock_file_info, stub_creds
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        remote_file = ftp.write_file(file=file_obj, dir="bar", remote=True)
+        assert remote_file.file_mtime == 1704070800
+        assert remote_file.file_size == 140401
+        assert remote_file.file_mode == 33188
+
+    def test_ftpClient_write_file_mlst_no_mode(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        ftp._features = frozenset({"MLST"})
+        mocker.patch.object(
+            ftp.connection,
+            "sendcmd",
+            return_value=(
+                "250-Listing bar/foo.mrc\n"
+                " type=file;size=1;modify=20240101010000; bar/foo.mrc\n250 End"
+            ),
+        )
+        transfercmd = mocker.spy(ftp.connection, "transfercmd")
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        remote_file = ftp.write_file(file=file_obj, dir="bar", remote=True)
+        assert remote_file.file_size == 1
+        assert remote_file.file_mode == 33188
+        assert transfercmd.call_args_list[-1] == mocker.call("LIST bar/foo.mrc")
+
+    def test_ftpClient_write_file_no_refresh(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        sendall = mocker.spy(ftp.connection.sock, "sendall")
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        remote_file = ftp.write_file(
+            file=file_obj, dir="bar", remote=True, refresh=False
+        )
+        sendall.assert_not_called()
+        assert remote_file.file_name == "foo.mrc"
+        assert remote_file.file_size == 1
+        assert remote_file.file_mtime > 1704070800
+
+    def test_ftpClient_write_file_no_pwd(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        pwd = mocker.spy(ftp.connection, "pwd")
+        transfercmd = mocker.spy(ftp.connection, "transfercmd")
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        ftp.write_file(file=file_obj, dir="bar", remote=True)
+        pwd.assert_not_called()
+        transfercmd.assert_called_once_with("STOR bar/foo.mrc")
+        assert ftp.connection.sock.commands == []
+
+    def test_ftpClient_check_dir_empty(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        pwd = mocker.spy(ftp.connection, "pwd")
+        cwd = mocker.spy(ftp.connection, "cwd")
+        ftp._check_dir("")
+        pwd.assert_not_called()
+        cwd.assert_not_called()
+
+    def test_ftpClient_cwd_cached(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        pwd = mocker.spy(ftp.connection, "pwd")
+        cwd = mocker.spy(ftp.connection, "cwd")
+        for _ in range(3):
+            ftp._check_dir("bar")
+        assert pwd.call_count == 1
+        cwd.assert_called_once_with("bar")
+        ftp.close()
+        assert ftp._cwd is None
+
+    def test_ftpClient_absolute_paths(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        pwd = mocker.spy(ftp.connection, "pwd")
+        cwd = mocker.spy(ftp.connection, "cwd")
+        transfercmd = mocker.spy(ftp.connection, "transfercmd")
+        voidcmd = mocker.spy(ftp.connection, "voidcmd")
+        ftp.fetch_file(file=mock_file_info, dir="/bar/")
+        ftp._features = frozenset()
+        ftp.get_file_data(file_name="foo.mrc", dir="/bar")
+        transfercmd.assert_any_call("RETR /bar/foo.mrc")
+        transfercmd.assert_any_call("LIST /bar/foo.mrc")
+        voidcmd.assert_any_call("MDTM /bar/foo.mrc")
+        pwd.assert_not_called()
+        cwd.assert_not_called()
+
+    def test_ftpClient_write_file_none_return(
+        self, mock_file_none_type_return, mock_file_info, stub_creds
+    ):
+        stub_creds["port"] = "21"
+        ftp = _ftpClient(**stub_creds)
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        with pytest.raises(RetrieverFileError):
+            ftp.write_file(file=file_obj, dir="bar", remote=True)
+
     def test_ftpClient_write_file_no_file_stream(
         self, mock_file_error, mock_file_info, stub_creds
     ):
@@ -230,6 +1233,114 @@ class TestMock_sftpClient:
         stub_creds["port"] = "22"
         sftp = _sftpClient(**stub_creds)
         assert sftp.connection is not None
+        assert sftp._ssh is not None
+        assert sftp._ssh.get_transport().default_window_size == 2**27
+        assert sftp._ssh.get_transport().default_max_packet_size == 2**19
+
+    def test_sftpClient_preferred_ciphers(self, mock_login, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        connect = mocker.spy(MockSSHClient, "connect")
+        sftp = _sftpClient(**stub_creds)
+        assert connect.call_args.kwargs["transport_factory"] == sftp._new_transport
+        sftp.preferred_ciphers = ("aes256-gcm@openssh.com", "foo")
+        sock, other = socket.socketpair()
+        with sock, other:
+            ciphers = sftp._new_transport(sock).get_security_options().ciphers
+        assert ciphers[0] == "aes256-gcm@openssh.com"
+        assert "foo" not in ciphers
+        assert len(ciphers) == len(set(ciphers))
+
+    def test_sftpClient_shared_transport(self, mock_login, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        connect = mocker.spy(MockSSHClient, "connect")
+        ssh_close = mocker.spy(MockSSHClient, "close")
+        sftp1 = _sftpClient(**stub_creds)
+        sftp2 = _sftpClient(**stub_creds)
+        assert connect.call_count == 1
+        assert sftp1._ssh is sftp2._ssh
+        assert sftp1.connection is not sftp2.connection
+        assert stub_creds["password"] not in next(iter(_sftpClient._shared_ssh))
+        sftp3 = _sftpClient(**stub_creds, compress=True)
+        assert connect.call_count == 2
+        sftp1.close()
+        sftp1.close()
+        ssh_close.assert_not_called()
+        sftp2.close()
+        sftp3.close()
+        assert ssh_close.call_count == 2
+        assert _sftpClient._shared_ssh == {}
+
+    def test_sftpClient_shared_transport_inactive(
+        self, mock_login, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp1 = _sftpClient(**stub_creds)
+        mocker.patch.object(sftp1._ssh.transport, "is_active", return_value=False)
+        sftp2 = _sftpClient(**stub_creds)
+        assert sftp1._ssh is not sftp2._ssh
+        ssh_close = mocker.spy(sftp1._ssh, "close")
+        sftp1.close()
+        ssh_close.assert_called_once()
+        assert len(_sftpClient._shared_ssh) == 1
+
+    def test_sftpClient_tune_socket(self, mock_login, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sock = socket.socket()
+        mocker.patch("tests.conftest.MockSocket", return_value=sock)
+        try:
+            sftp = _sftpClient(**stub_creds)
+            assert sftp._ssh.get_transport().sock is sock
+            assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+        finally:
+            sock.close()
+
+    def test_sftpClient_tune_socket_channel(self, mock_login, stub_creds):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        assert sftp._ssh.get_transport().sock.options == {}
+
+    def test_sftpClient_shared_transport_open_error(
+        self, mock_login, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        mocker.patch.object(MockSSHClient, "open_sftp", side_effect=OSError)
+        with pytest.raises(OSError):
+            _sftpClient(**stub_creds)
+        assert _sftpClient._shared_ssh[sftp._ssh_key][1] == 1
+        ssh_close = mocker.spy(sftp._ssh, "close")
+        sftp.close()
+        ssh_close.assert_called_once()
+        with pytest.raises(OSError):
+            _sftpClient(**stub_creds)
+        assert _sftpClient._shared_ssh == {}
+
+    def test_sftpClient_reconnect(self, mock_login, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        lost = sftp.connection
+        mocker.patch.object(lost, "listdir", side_effect=EOFError)
+        mocker.patch.object(lost, "get_channel", return_value=None)
+        assert sftp.list_file_names(dir="testdir") == ["foo.mrc"]
+        assert sftp.connection is not lost
+        assert _sftpClient._shared_ssh[sftp._ssh_key][1] == 1
+        assert sftp._spawn()._reconnect() is False
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_sftpClient_compress(self, mock_login, stub_creds, mocker, compress):
+        connect = mocker.spy(MockSSHClient, "connect")
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds, compress=compress)
+        assert sftp.compress is compress
+        assert connect.call_args.kwargs["compress"] is compress
+
+    def test_sftpClient_new_channel(self, mock_login, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        connect = mocker.spy(sftp._ssh, "connect")
+        channel = sftp._new_channel()
+        assert channel is not sftp.connection
+        connect.assert_not_called()
 
     def test_sftpClient_no_host_keys(self, mock_sftp_no_host_keys, stub_creds, caplog):
         stub_creds["port"] = "22"
@@ -244,6 +1355,15 @@ class TestMock_sftpClient:
         sftp = _sftpClient(**stub_creds)
         assert sftp.connection is not None
 
+    def test_sftpClient_host_keys_file_cached(self, mock_login, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        isfile = mocker.spy(os.path, "isfile")
+        sftp1 = _sftpClient(**stub_creds)
+        mocker.patch.object(sftp1._ssh.transport, "is_active", return_value=False)
+        sftp2 = _sftpClient(**stub_creds)
+        assert sftp1._ssh is not sftp2._ssh
+        assert isfile.call_count == 1
+
     def test_sftpClient_no_creds(self, mock_login):
         creds = {}
         with pytest.raises(TypeError):
@@ -279,6 +1399,19 @@ class TestMock_sftpClient:
         with does_not_raise():
             sftp._check_dir(dir="foo")
 
+    @pytest.mark.parametrize(
+        "dir, calls",
+        [("foo", [None, "foo"]), ("/foo", ["/foo"])],
+    )
+    def test_sftpClient_check_dir_chdir_calls(
+        self, mock_Client_in_other_dir, stub_creds, mocker, dir, calls
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        chdir = mocker.spy(sftp.connection, "chdir")
+        sftp._check_dir(dir=dir)
+        assert [i.args[0] for i in chdir.call_args_list] == calls
+
     def test_sftpClient_is_file(self, mock_Client, stub_creds):
         stub_creds["port"] = "22"
         sftp = _sftpClient(**stub_creds)
@@ -315,6 +1448,85 @@ class TestMock_sftpClient:
         fh = sftp.fetch_file(file=mock_file_info, dir="bar")
         assert fh.file_stream.getvalue()[0:1] == b"0"
 
+    def test_sftpClient_fetch_file_prefetch(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sftp.blocksize = 2
+        prefetch = mocker.spy(MockSFTPFile, "prefetch")
+        stat = mocker.spy(sftp.connection, "stat")
+        fh = sftp.fetch_file(file=mock_file_info, dir="bar")
+        assert fh.file_stream.getvalue() == b"00000"
+        assert prefetch.call_args.args[1] == 140401
+        assert prefetch.call_args.kwargs["max_concurrent_requests"] == 64
+        stat.assert_not_called()
+
+    def test_sftpClient_fetch_file_request_size(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds, request_size=2**18, prefetch_requests=128)
+        sftp_open = mocker.spy(sftp.connection, "open")
+        prefetch = mocker.spy(MockSFTPFile, "prefetch")
+        sftp.fetch_file(file=mock_file_info, dir="bar")
+        assert sftp_open.spy_return.MAX_REQUEST_SIZE == 2**18
+        assert prefetch.call_args.kwargs["max_concurrent_requests"] == 128
+        assert _sftpClient.request_size == 32768
+        assert _sftpClient.prefetch_requests == 64
+
+    def test_sftpClient_fetch_file_spill(self, mock_Client, mock_file_info, stub_creds):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sftp.spill_threshold = 2
+        fh = sftp.fetch_file(file=mock_file_info, dir="bar")
+        assert not isinstance(fh.file_stream, io.BytesIO)
+        fh.file_stream.seek(0)
+        assert fh.file_stream.read() == b"00000"
+        remote_file = sftp.write_file(file=fh, dir="bar", remote=True)
+        assert remote_file.file_size == 140401
+
+    def test_sftpClient_fetch_file_sink(self, mock_Client, mock_file_info, stub_creds):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sink = io.BytesIO(b"xx")
+        sink.seek(2)
+        fh = sftp.fetch_file(file=mock_file_info, dir="bar", sink=sink)
+        assert fh.file_stream is sink
+        assert sink.getvalue() == b"xx00000"
+
+    def test_sftpClient_fetch_file_to_path(
+        self, mock_Client, mock_file_info, mock_open_file, stub_creds
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        file = sftp.fetch_file_to_path(
+            file=mock_file_info, dir="bar", local_path="baz/foo.mrc"
+        )
+        mock_open_file.assert_called_once_with("baz/foo.mrc", "wb", buffering=0)
+        mock_open_file.return_value.write.assert_called_once_with(b"00000")
+        assert file.file_name == "foo.mrc"
+
+    def test_sftpClient_fetch_file_shrunk(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        mocker.patch.object(MockSFTPFile, "read", side_effect=EOFError)
+        with pytest.raises(RetrieverFileError):
+            sftp.fetch_file(file=mock_file_info, dir="bar")
+
+    def test_sftpClient_fetch_file_eof_connection_lost(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        mocker.patch.object(MockSFTPFile, "read", side_effect=EOFError)
+        mocker.patch.object(sftp.connection, "get_channel", return_value=None)
+        mocker.patch.object(sftp, "_reconnect", return_value=False)
+        with pytest.raises(EOFError):
+            sftp.fetch_file(file=mock_file_info, dir="bar")
+
     def test_sftpClient_fetch_file_error(
         self, mock_file_error, mock_file_info, stub_creds
     ):
@@ -323,6 +1535,71 @@ class TestMock_sftpClient:
         with pytest.raises(RetrieverFileError):
             sftp.fetch_file(file=mock_file_info, dir="bar")
 
+    def test_sftpClient_fetch_files(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        open_sftp = mocker.spy(sftp._ssh, "open_sftp")
+        ssh_close = mocker.spy(sftp._ssh, "close")
+        files = sftp.fetch_files(files=[mock_file_info] * 2, dir="bar", workers=4)
+        assert [i.file_stream.getvalue() for i in files] == [b"00000"] * 2
+        assert open_sftp.call_count == 1
+        ssh_close.assert_not_called()
+
+    def test_sftpClient_fetch_files_order(self, mock_Client, stub_creds):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        files = [
+            FileInfo(
+                file_name=f"{i}.mrc", file_mtime=1704070800, file_mode=None, file_size=5
+            )
+            for i in range(10)
+        ]
+        fetched = sftp.fetch_files(files=files, dir="bar", workers=3)
+        assert [i.file_name for i in fetched] == [f"{i}.mrc" for i in range(10)]
+
+    def test_sftpClient_fetch_files_by_name(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        listdir_attr = mocker.spy(sftp.connection, "listdir_attr")
+        stat = mocker.spy(sftp.connection, "stat")
+        files = sftp.fetch_files(files=["foo.mrc"] * 3, dir="bar", workers=2)
+        assert [i.file_name for i in files] == ["foo.mrc"] * 3
+        assert [i.file_size for i in files] == [140401] * 3
+        listdir_attr.assert_called_once_with("bar")
+        stat.assert_not_called()
+
+    def test_sftpClient_fetch_files_by_name_single(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        listdir_attr = mocker.spy(sftp.connection, "listdir_attr")
+        stat = mocker.spy(sftp.connection, "stat")
+        files = sftp.fetch_files(files=[mock_file_info, "foo.mrc"], dir="bar")
+        assert [i.file_name for i in files] == ["foo.mrc"] * 2
+        listdir_attr.assert_not_called()
+        stat.assert_called_once_with("bar/foo.mrc")
+
+    def test_sftpClient_list_file_data_many(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        open_sftp = mocker.spy(sftp._ssh, "open_sftp")
+        files = sftp.list_file_data_many(dirs=["foo", "bar"])
+        assert [[i.file_name for i in v] for v in files.values()] == [["foo.mrc"]] * 2
+        assert open_sftp.call_count == 1
+
+    def test_sftpClient_write_files(self, mock_Client, mock_file_info, stub_creds):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        files = [
+            File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+            for _ in range(3)
+        ]
+        written = sftp.write_files(files=files, dir="bar")
+        assert [i.file_size for i in written] == [140401] * 3
+
     def test_sftpClient_get_file_data(self, mock_Client, stub_creds):
         stub_creds["port"] = "22"
         ftp = _sftpClient(**stub_creds)
@@ -355,6 +1632,96 @@ class TestMock_sftpClient:
         assert files[0].file_gid == 0
         assert files[0].file_atime is None
 
+    def test_sftpClient_get_file_data_cached(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sftp.cache_ttl = 30.0
+        stat = mocker.spy(sftp.connection, "stat")
+        sftp.list_file_data(dir="testdir")
+        file_data = sftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert file_data.file_size == 140401
+        stat.assert_not_called()
+        sftp.get_file_data(file_name="foo.mrc", dir="otherdir")
+        assert stat.call_count == 1
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        sftp.write_file(file=file_obj, dir="testdir", remote=True)
+        assert "testdir" not in sftp._dir_cache
+
+    def test_sftpClient_check_dir_empty(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        getcwd = mocker.spy(sftp.connection, "getcwd")
+        chdir = mocker.spy(sftp.connection, "chdir")
+        sftp._check_dir("")
+        getcwd.assert_not_called()
+        chdir.assert_not_called()
+
+    def test_sftpClient_cwd_cached(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        getcwd = mocker.spy(sftp.connection, "getcwd")
+        chdir = mocker.spy(sftp.connection, "chdir")
+        for _ in range(3):
+            sftp._check_dir("testdir")
+        assert getcwd.call_count == 1
+        chdir.assert_called_once_with("testdir")
+        assert sftp._spawn()._cwd is None
+
+    def test_sftpClient_absolute_paths(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sftp_open = mocker.spy(sftp.connection, "open")
+        stat = mocker.spy(sftp.connection, "stat")
+        chdir = mocker.spy(sftp.connection, "chdir")
+        sftp.fetch_file(file=mock_file_info, dir="/testdir")
+        sftp.get_file_data(file_name="foo.mrc", dir="/testdir")
+        sftp_open.assert_called_once_with("/testdir/foo.mrc", "rb")
+        stat.assert_called_once_with("/testdir/foo.mrc")
+        chdir.assert_not_called()
+
+    def test_sftpClient_get_file_data_cache_expired(
+        self, mock_Client, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sftp.cache_ttl = 0
+        stat = mocker.spy(sftp.connection, "stat")
+        sftp.list_file_data(dir="testdir")
+        sftp.get_file_data(file_name="foo.mrc", dir="testdir")
+        assert stat.call_count == 1
+
+    def test_sftpClient_listing_cached(self, mock_Client, stub_creds, mocker):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sftp.cache_ttl = 30.0
+        listdir_attr = mocker.spy(sftp.connection, "listdir_attr")
+        listdir = mocker.spy(sftp.connection, "listdir")
+        files = sftp.list_file_data(dir="testdir")
+        cached = sftp.list_file_data(dir="testdir")
+        assert [i.file_name for i in cached] == [i.file_name for i in files]
+        assert cached[0] is not files[0]
+        assert sftp.list_file_names(dir="testdir") == [i.file_name for i in files]
+        assert listdir_attr.call_count == 1
+        listdir.assert_not_called()
+
+    def test_sftpClient_list_file_data_single_request(
+        self, mock_Client, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        listdir_attr = mocker.spy(sftp.connection, "listdir_attr")
+        stat = mocker.spy(sftp.connection, "stat")
+        lstat = mocker.spy(sftp.connection, "lstat")
+        files = sftp.list_file_data(dir="testdir")
+        assert [i.file_name for i in files] == ["foo.mrc"]
+        listdir_attr.assert_called_once_with("testdir")
+        stat.assert_not_called()
+        lstat.assert_not_called()
+
     def test_sftpClient_list_file_data_error(self, mock_file_error, stub_creds):
         stub_creds["port"] = "22"
         sftp = _sftpClient(**stub_creds)
@@ -398,6 +1765,32 @@ class TestMock_sftpClient:
         assert remote_file.file_mtime == 1704070800
         assert local_file.file_mtime == 1704070800
 
+    def test_sftpClient_write_file_no_refresh(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        stat = mocker.spy(sftp.connection, "stat")
+        file_obj = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        files = sftp.write_files(files=[file_obj], dir="bar", refresh=False)
+        stat.assert_not_called()
+        assert files[0].file_size == 1
+
+    def test_sftpClient_write_file_unbuffered(
+        self, mock_Client, mock_file_info, stub_creds, mocker
+    ):
+        stub_creds["port"] = "22"
+        sftp = _sftpClient(**stub_creds)
+        sftp_open = mocker.spy(sftp.connection, "open")
+        file_obj = File.from_fileinfo(
+            file=mock_file_info, file_stream=io.BytesIO(b"00000")
+        )
+        sftp.write_file(file=file_obj, dir="bar", remote=True)
+        sftp_open.assert_called_once_with("bar/foo.mrc", "wb", bufsize=0)
+        assert sftp_open.spy_return.written == b"00000"
+        file_obj.file_stream.seek(0, io.SEEK_END)
+        assert file_obj.file_stream.write(b"1") == 1
+
     def test_sftpClient_write_file_no_file_stream(
         self, mock_file_error, mock_file_info, stub_creds
     ):
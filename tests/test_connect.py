@@ -104,6 +104,76 @@ class TestMockClient:
         file_exists = connect.check_file(file=mock_file_info, dir="bar", remote=True)
         assert file_exists is False
 
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_check_file_cached(
+        self, mock_login, stub_Client_creds, mock_file_info, mocker, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds, cache_ttl=30.0)
+        connect.list_file_info(remote_dir="bar")
+        mock_connection = mocker.patch.object(connect.session, "connection")
+        file_exists = connect.check_file(file=mock_file_info, dir="bar", remote=True)
+        assert file_exists is True
+        assert mock_connection.mock_calls == []
+
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_cache_ttl(self, mock_Client, stub_Client_creds, port):
+        stub_Client_creds["port"] = port
+        default = Client(**stub_Client_creds)
+        connect = Client(**stub_Client_creds, cache_ttl=30.0)
+        assert default.session.cache_ttl == 0
+        assert connect.session.cache_ttl == 30.0
+        default.list_file_info(remote_dir="bar")
+        connect.list_file_info(remote_dir="bar")
+        assert default.session._cached_listing("bar") is None
+        assert connect.session._cached_listing("bar") is not None
+
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_check_files(
+        self, mock_Client, stub_Client_creds, mock_file_info, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        other_file = FileInfo(
+            file_name="bar.mrc", file_mtime=1704070800, file_mode=None, file_size=1
+        )
+        files = connect.check_files(
+            files=[mock_file_info, other_file], dir="bar", remote=True
+        )
+        assert files == {"foo.mrc": True, "bar.mrc": False}
+
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_check_files_duplicate_names(
+        self, mock_Client, stub_Client_creds, mock_file_info, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        other_size = FileInfo(
+            file_name="foo.mrc", file_mtime=1704070800, file_mode=None, file_size=1
+        )
+        files = connect.check_files(
+            files=[mock_file_info, other_size], dir="bar", remote=True
+        )
+        assert files == {"foo.mrc": False}
+
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_check_files_local(
+        self, mock_Client_file_exists, stub_Client_creds, mock_file_info, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        files = connect.check_files(files=[mock_file_info], dir="bar", remote=False)
+        assert files == {"foo.mrc": True}
+
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_check_files_error(
+        self, mock_file_error, stub_Client_creds, mock_file_info, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        files = connect.check_files(files=[mock_file_info], dir="bar", remote=True)
+        assert files == {"foo.mrc": False}
+
     @pytest.mark.parametrize(
         "port",
         [21, 22],
@@ -128,6 +198,20 @@ class TestMockClient:
         with pytest.raises(RetrieverFileError):
             connect.get_file(file=file_obj, remote_dir="bar_dir")
 
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_get_files(
+        self, mock_Client, mock_file_info, stub_Client_creds, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds, max_workers=2)
+        files = connect.get_files(
+            files=[mock_file_info, mock_file_info], remote_dir="testdir"
+        )
+        assert connect.max_workers == 2
+        assert len(files) == 2
+        assert all(isinstance(file, File) for file in files)
+        assert all(file.file_name == "foo.mrc" for file in files)
+
     @pytest.mark.parametrize("port", [21, 22])
     def test_Client_get_file_info(self, mock_Client, stub_Client_creds, port):
         stub_Client_creds["port"] = port
@@ -145,6 +229,35 @@ class TestMockClient:
         with pytest.raises(RetrieverFileError):
             connect.get_file_info(file_name="foo.mrc", remote_dir="testdir")
 
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_get_files_info(self, mock_Client, stub_Client_creds, port):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        files = connect.get_files_info(
+            file_names=["foo.mrc", "foo.mrc"], remote_dir="testdir"
+        )
+        assert [i.file_name for i in files] == ["foo.mrc", "foo.mrc"]
+        assert files[0].file_size == 140401
+
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_get_files_info_not_listed(
+        self, mock_Client, stub_Client_creds, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        files = connect.get_files_info(file_names=["bar.mrc"], remote_dir="testdir")
+        assert len(files) == 1
+        assert isinstance(files[0], FileInfo)
+
+    @pytest.mark.parametrize("port", [21, 22])
+    def test_Client_get_files_info_error(
+        self, mock_file_error, stub_Client_creds, port
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        with pytest.raises(RetrieverFileError):
+            connect.get_files_info(file_names=["foo.mrc"], remote_dir="testdir")
+
     @pytest.mark.parametrize("port", [21, 22])
     def test_Client_is_file(self, mock_Client, stub_Client_creds, port):
         stub_Client_creds["port"] = port
@@ -271,6 +384,44 @@ class TestMockClient:
         )
 
 
+    @pytest.mark.parametrize(
+        "port, remote",
+        [(21, True), (21, False), (22, True), (22, False)],
+    )
+    def test_Client_put_files(
+        self, mock_Client, mock_file_info, stub_Client_creds, port, remote
+    ):
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds, max_workers=2)
+        file = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        written = connect.put_files(
+            files=[file, file], dir="bar", remote=remote, check=False
+        )
+        assert len(written) == 2
+        assert all(i.file_mtime == 1704070800 for i in written)
+
+    @pytest.mark.parametrize(
+        "port, remote",
+        [(21, True), (21, False), (22, True), (22, False)],
+    )
+    def test_Client_put_files_exists(
+        self,
+        mock_Client_file_exists,
+        mock_file_info,
+        stub_Client_creds,
+        caplog,
+        port,
+        remote,
+    ):
+        caplog.set_level(logging.DEBUG)
+        stub_Client_creds["port"] = port
+        connect = Client(**stub_Client_creds)
+        file = File.from_fileinfo(file=mock_file_info, file_stream=io.BytesIO(b"0"))
+        written = connect.put_files(files=[file], dir="bar", remote=remote, check=True)
+        assert written == [None]
+        assert "foo.mrc already exists in `bar`. Skipping copy." in caplog.text
+
+
 @pytest.mark.livetest
 class TestLiveClient:
     def test_Client_ftp_live_test_leila(self, live_creds):
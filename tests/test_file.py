@@ -1,7 +1,8 @@
+import datetime
 import io
 import paramiko
 import pytest
-from file_retriever.file import FileInfo, File
+from file_retriever.file import FileInfo, File, _parse_mdtm_time
 
 
 def test_FileInfo():
@@ -92,6 +93,67 @@ def test_FileInfo_from_stat_data_no_file_mode(mock_sftp_attr):
     assert "No file mode provided" in str(exc)
 
 
+def test_FileInfo_from_mlsd_facts():
+    file = FileInfo.from_mlsd_facts(
+        file_name="foo.mrc",
+        facts={
+            "type": "file",
+            "size": "140401",
+            "modify": "20240101010000.123",
+            "unix.mode": "0644",
+            "unix.uid": "1000",
+            "unix.gid": "100",
+        },
+    )
+    assert file.file_name == "foo.mrc"
+    assert file.file_mtime == 1704070800
+    assert file.file_mode == 33188
+    assert file.file_size == 140401
+    assert file.file_uid == 1000
+    assert file.file_gid == 100
+    assert file.file_atime is None
+
+
+def test_FileInfo_from_mlsd_line():
+    file = FileInfo.from_mlsd_line(
+        "Type=file;Size=140401;Modify=20240101010000;UNIX.mode=0644; foo bar.mrc\r\n"
+    )
+    assert file.file_name == "foo bar.mrc"
+    assert file.file_mtime == 1704070800
+    assert file.file_mode == 33188
+    assert file.file_size == 140401
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "type=file;modify=20240101010000; foo.mrc",
+        "type=file;size=1; foo.mrc",
+    ],
+)
+def test_FileInfo_from_mlsd_line_missing_facts(line):
+    with pytest.raises(ValueError):
+        FileInfo.from_mlsd_line(line)
+
+
+def test_FileInfo_from_mlsd_facts_file_mode():
+    file = FileInfo.from_mlsd_facts(
+        file_name="foo.mrc",
+        facts={"size": "1", "modify": "20240101010000"},
+        file_mode="-rw-r--r--",
+    )
+    assert file.file_mode == 33188
+
+
+def test_FileInfo_from_mlsd_facts_no_unix_facts():
+    file = FileInfo.from_mlsd_facts(
+        file_name="foo.mrc", facts={"size": "1", "modify": "20240101010000"}
+    )
+    assert file.file_mode == 0
+    assert file.file_uid is None
+    assert file.file_gid is None
+
+
 @pytest.mark.parametrize(
     "str_time, mtime",
     [
@@ -107,6 +169,10 @@ def test_FileInfo_from_stat_data_no_file_mode(mock_sftp_attr):
             "20240303030303",
             1709434983,
         ),
+        (
+            "20240101010000.123",
+            1704070800,
+        ),
     ],
 )
 def test_FileInfo_parse_mdtm_time(str_time, mtime):
@@ -116,6 +182,19 @@ def test_FileInfo_parse_mdtm_time(str_time, mtime):
     assert file.file_mtime == mtime
 
 
+@pytest.mark.parametrize(
+    "str_time",
+    ["19700101000000", "19991231235959", "20240229120000", "20381231235959"],
+)
+def test_parse_mdtm_time_matches_strptime(str_time):
+    expected = (
+        datetime.datetime.strptime(str_time, "%Y%m%d%H%M%S")
+        .replace(tzinfo=datetime.timezone.utc)
+        .timestamp()
+    )
+    assert _parse_mdtm_time(str_time) == int(expected)
+
+
 @pytest.mark.parametrize(
     "str_permissions, decimal_permissions",
     [
@@ -144,6 +223,19 @@ def test_FileInfo_parse_permissions(str_permissions, decimal_permissions):
     assert file.file_mode == decimal_permissions
 
 
+def test_FileInfo_slots():
+    file = FileInfo(
+        file_name="foo.mrc", file_mtime=1704070800, file_mode="-rw-r--r--", file_size=1
+    )
+    assert "file_name" in FileInfo.__slots__
+    assert not hasattr(file, "__dict__")
+    assert not hasattr(file, "file_stream")
+    file.file_stream = io.BytesIO(b"0")
+    assert file.file_stream.getvalue() == b"0"
+    with pytest.raises(AttributeError):
+        file.foo = "bar"
+
+
 def test_File():
     foo = File(
         file_name="foo.mrc",